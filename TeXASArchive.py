@@ -0,0 +1,830 @@
+# -*- coding: utf-8 -*-
+"""`texas.TeXASArchive`
+
+Archive writers with block-parallel compression, used by `TeXASDist`.
+"""
+
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+_default_block_size = 1 << 20
+
+# Members with these suffixes are already compressed
+_incompressible_suffixes = ['.7z', '.bz2', '.gif', '.gz', '.jpeg', '.jpg',
+                            '.lz', '.lzma', '.pdf', '.png', '.tgz', '.txz',
+                            '.xz', '.zip', '.zst']
+
+# Data is incompressible if its samples shrink less than that
+_incompressible_ratio = 0.95
+
+# Reproducible archives clamp mtimes to this, if SOURCE_DATE_EPOCH is unset
+# (1980-01-01, the earliest date representable in zip archives)
+_default_epoch = 315532800
+
+def get_jobs(env, var, **kw):
+    """Return the number of worker threads requested by the ``jobs`` keyword
+    or construction variable ``var``; ``0`` means one per CPU"""
+    import SCons.Errors
+    try:
+        jobs = kw['jobs']
+    except KeyError:
+        jobs = env.subst('$%s' % var) or 1
+    try:
+        jobs = int(jobs)
+    except (TypeError, ValueError):
+        raise SCons.Errors.UserError('Invalid number of jobs: %r' % jobs)
+    if jobs < 1:
+        import multiprocessing
+        jobs = multiprocessing.cpu_count()
+    return jobs
+
+def is_true(value):
+    """Tell whether ``value`` stands for true; besides booleans and numbers,
+    strings such as ``'1'``, ``'yes'`` or ``'on'`` are true, while ``'0'``,
+    ``'no'`` or ``'False'`` are false"""
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'y', 'on')
+
+def get_flag(env, var, key=None, default=False, **kw):
+    """Return the boolean option requested by the ``key`` keyword or
+    construction variable ``var``; ``default`` if none of them is set"""
+    try:
+        value = kw[key]
+    except KeyError:
+        value = env.subst('$%s' % var)
+        if not value:
+            return default
+    return is_true(value)
+
+def _block_size(env, default=_default_block_size):
+    size = env.subst('$TEXASARCHIVEBLOCKSIZE')
+    if size:
+        return max(int(size), 1)
+    return default
+
+def get_incompressible_suffixes(env):
+    """Return the (lower-case) suffixes of incompressible files"""
+    import SCons.Util
+    suffixes = env.get('TEXASINCOMPRESSIBLESUFFIXES', _incompressible_suffixes)
+    return tuple(s.lower() for s in SCons.Util.flatten(suffixes))
+
+def has_suffix(path, suffixes):
+    return str(path).lower().endswith(suffixes)
+
+def is_incompressible(data):
+    """Estimate, whether ``data`` is incompressible, by deflating a few
+    small samples of it with the fastest compression level"""
+    import zlib
+    size = 4096
+    if len(data) <= 4 * size:
+        samples = [data]
+    else:
+        step = len(data) // 4
+        samples = [data[i*step:i*step+size] for i in range(4)]
+    total = sum(len(x) for x in samples)
+    if total < 512:
+        return False
+    packed = sum(len(zlib.compress(x, 1)) for x in samples)
+    return packed > _incompressible_ratio * total
+
+def group_incompressible(source, suffixes):
+    """Move files with ``suffixes`` to the end of ``source`` (stable)"""
+    import SCons.Util
+    source = SCons.Util.flatten(source)
+    last = [s for s in source if has_suffix(s, suffixes)]
+    if not last:
+        return source
+    return [s for s in source if not has_suffix(s, suffixes)] + last
+
+def source_date_epoch(env):
+    """Return ``SOURCE_DATE_EPOCH`` from the environment of ``env``, or
+    of the process, or the default epoch"""
+    import os
+    try:
+        value = env['ENV']['SOURCE_DATE_EPOCH']
+    except KeyError:
+        value = os.environ.get('SOURCE_DATE_EPOCH')
+    if value:
+        return int(value)
+    return _default_epoch
+
+def _normal_mode(mode, isdir):
+    """Permission bits of members of reproducible archives"""
+    return 0o755 if isdir or mode & 0o100 else 0o644
+
+def _reproducible_filter(epoch):
+    """``tarfile`` filter normalizing members of reproducible archives"""
+    def reset(tarinfo):
+        tarinfo.uid = tarinfo.gid = 0
+        tarinfo.uname = tarinfo.gname = ''
+        tarinfo.mtime = min(int(tarinfo.mtime), epoch)
+        tarinfo.mode = _normal_mode(tarinfo.mode, tarinfo.isdir())
+        return tarinfo
+    return reset
+
+class _StreamWriter(object):
+    """Sequential writer, optionally compressing with ``compressor``"""
+
+    def __init__(self, fileobj, compressor=None, **kw):
+        self.fileobj = fileobj
+        self.compressor = compressor
+
+    def write(self, data):
+        count = len(data)
+        if self.compressor is not None:
+            data = self.compressor.compress(data)
+        self.fileobj.write(data)
+        return count
+
+    def close(self):
+        if self.compressor is not None:
+            self.fileobj.write(self.compressor.flush())
+
+class _BlockWriter(object):
+    """Write-only file object, which splits the data written to it into
+    blocks of fixed size and compresses the blocks independently in a pool of
+    threads. The compressed blocks are written to the underlying file in
+    order. Subclasses implement the actual format by overriding
+    ``_compress()``, ``_header()``, ``_trailer()`` and, optionally,
+    ``_emit()``. If ``store_incompressible`` is true, the blocks found
+    incompressible (see ``is_incompressible()``) are stored instead of being
+    compressed.
+    """
+
+    def __init__(self, fileobj, jobs=1, block_size=_default_block_size,
+                 store_incompressible=False):
+        import collections
+        self.fileobj = fileobj
+        self.jobs = jobs
+        self.block_size = block_size
+        self.store_incompressible = store_incompressible
+        self.buf = []
+        self.buflen = 0
+        self.prev = b''
+        self.pending = collections.deque()
+        self.closed = False
+        if jobs > 1:
+            from multiprocessing.pool import ThreadPool
+            self.pool = ThreadPool(jobs)
+        else:
+            self.pool = None
+        self.fileobj.write(self._header())
+
+    def _header(self):
+        return b''
+
+    def _trailer(self):
+        return b''
+
+    def _update(self, block):
+        """Called (sequentially) for each uncompressed block"""
+        pass
+
+    def _emit(self, result):
+        """Called (sequentially) with the results of ``_compress()``"""
+        self.fileobj.write(result)
+
+    def _compress(self, block, prev, last):
+        """Compress ``block``; ``prev`` is the preceding uncompressed block
+        and ``last`` tells whether this is the last block"""
+        raise NotImplementedError
+
+    def _submit(self, block, last):
+        self._update(block)
+        args = (block, self.prev, last)
+        self.prev = block
+        if self.pool is None:
+            self._emit(self._compress(*args))
+            return
+        self.pending.append(self.pool.apply_async(self._compress, args))
+        while len(self.pending) > 2 * self.jobs:
+            self._emit(self.pending.popleft().get())
+
+    def write(self, data):
+        if self.closed:
+            raise ValueError('write to closed file')
+        count = len(data)
+        self.buf.append(bytes(data))
+        self.buflen += count
+        if self.buflen >= self.block_size:
+            data = b''.join(self.buf)
+            size = self.block_size
+            end = len(data) - len(data) % size
+            for i in range(0, end, size):
+                self._submit(data[i:i+size], False)
+            self.buf = [data[end:]]
+            self.buflen = len(data) - end
+        return count
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self._submit(b''.join(self.buf), True)
+            self.buf = []
+            while self.pending:
+                self._emit(self.pending.popleft().get())
+            self.fileobj.write(self._trailer())
+        finally:
+            self.closed = True
+            if self.pool is not None:
+                self.pool.close()
+                self.pool.join()
+
+class GzipWriter(_BlockWriter):
+    """Block-parallel gzip writer (in the style of ``pigz``).
+
+    Each block is compressed to a raw deflate stream primed with the last
+    32KiB of the preceding block, and terminated with a sync flush (the last
+    one with ``Z_FINISH``). The concatenated blocks form a single, standard
+    gzip member.
+    """
+
+    def __init__(self, fileobj, name='', level=9, mtime=None, **kw):
+        import time
+        self.name = name
+        self.level = level
+        self.mtime = int(time.time()) if mtime is None else int(mtime)
+        self.crc = 0
+        self.size = 0
+        super(GzipWriter, self).__init__(fileobj, **kw)
+
+    def _header(self):
+        import struct
+        if self.level == 9:
+            xfl = b'\002'
+        elif self.level == 1:
+            xfl = b'\004'
+        else:
+            xfl = b'\000'
+        name = self.name.encode('iso-8859-1', 'replace')
+        flags = b'\010' if name else b'\000'
+        header = b'\037\213\010' + flags + struct.pack('<L', self.mtime) \
+               + xfl + b'\377'
+        if name:
+            header += name + b'\000'
+        return header
+
+    def _trailer(self):
+        import struct
+        return struct.pack('<LL', self.crc, self.size & 0xffffffff)
+
+    def _update(self, block):
+        import zlib
+        self.crc = zlib.crc32(block, self.crc) & 0xffffffff
+        self.size += len(block)
+
+    def _compress(self, block, prev, last):
+        import zlib
+        # Incompressible blocks are just stored (level 0), if requested
+        if self.store_incompressible and is_incompressible(block):
+            level = 0
+        else:
+            level = self.level
+        args = (level, zlib.DEFLATED, -zlib.MAX_WBITS, zlib.DEF_MEM_LEVEL,
+                zlib.Z_DEFAULT_STRATEGY)
+        if prev:
+            try:
+                c = zlib.compressobj(*args, zdict=prev[-32768:])
+            except TypeError:
+                # Python 2 - no preset dictionaries
+                c = zlib.compressobj(*args)
+        else:
+            c = zlib.compressobj(*args)
+        mode = zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+        return c.compress(block) + c.flush(mode)
+
+# LZMA2 dictionary sizes used by xz presets 0..9
+_xz_dict_sizes = [1 << 18, 1 << 20, 1 << 21, 1 << 22, 1 << 22,
+                  1 << 23, 1 << 23, 1 << 24, 1 << 25, 1 << 26]
+
+def _xz_varint(num):
+    out = bytearray()
+    while num >= 0x80:
+        out.append((num & 0x7f) | 0x80)
+        num >>= 7
+    out.append(num)
+    return bytes(out)
+
+def _xz_dict_prop(size):
+    """Encode LZMA2 dictionary size; return ``(property, size)``"""
+    for prop in range(40):
+        encoded = (2 | (prop & 1)) << (prop // 2 + 11)
+        if encoded >= size:
+            return prop, encoded
+    return 40, 0xffffffff
+
+def _lzma2_stored(data):
+    """Wrap ``data`` into uncompressed LZMA2 chunks"""
+    import struct
+    chunks = []
+    control = 1     # uncompressed, dictionary reset
+    for i in range(0, len(data), 1 << 16):
+        chunk = data[i:i + (1 << 16)]
+        chunks.append(struct.pack('>BH', control, len(chunk) - 1) + chunk)
+        control = 2 # uncompressed, no reset
+    chunks.append(b'\000')
+    return b''.join(chunks)
+
+class XzWriter(_BlockWriter):
+    """Block-parallel xz writer.
+
+    Produces single ``.xz`` stream with one LZMA2 block per block of input
+    data. Block headers record compressed and uncompressed sizes, so that
+    multi-threaded decoders (``xz -T``) may decompress the blocks in
+    parallel. Blocks are protected with CRC32 checks.
+    """
+
+    _flags = b'\000\001'  # check type: CRC32
+
+    def __init__(self, fileobj, preset=6, **kw):
+        self.preset = preset
+        self.records = []
+        kw.setdefault('block_size', 3 * _xz_dict_sizes[preset & 0xf])
+        size = max(min(_xz_dict_sizes[preset & 0xf], kw['block_size']), 4096)
+        self.dict_prop, self.dict_size = _xz_dict_prop(size)
+        super(XzWriter, self).__init__(fileobj, **kw)
+
+    def _header(self):
+        import struct
+        import zlib
+        return b'\3757zXZ\000' + self._flags \
+             + struct.pack('<L', zlib.crc32(self._flags) & 0xffffffff)
+
+    def _compress(self, block, prev, last):
+        import lzma
+        import struct
+        import zlib
+        if not block:
+            return None
+        if self.store_incompressible and is_incompressible(block):
+            data = _lzma2_stored(block)
+        else:
+            filters = [{'id': lzma.FILTER_LZMA2, 'preset': self.preset,
+                        'dict_size': self.dict_size}]
+            data = lzma.compress(block, format=lzma.FORMAT_RAW,
+                                 filters=filters)
+        header = b'\300' + _xz_varint(len(data)) + _xz_varint(len(block)) \
+               + b'\041\001' + struct.pack('B', self.dict_prop)
+        header += b'\000' * (-(len(header) + 1) % 4)
+        header = struct.pack('B', (len(header) + 5) // 4 - 1) + header
+        header += struct.pack('<L', zlib.crc32(header) & 0xffffffff)
+        check = struct.pack('<L', zlib.crc32(block) & 0xffffffff)
+        unpadded = len(header) + len(data) + len(check)
+        padding = b'\000' * (-len(data) % 4)
+        return (header + data + padding + check, unpadded, len(block))
+
+    def _emit(self, result):
+        if result is not None:
+            self.fileobj.write(result[0])
+            self.records.append(result[1:])
+
+    def _trailer(self):
+        import struct
+        import zlib
+        index = b'\000' + _xz_varint(len(self.records))
+        for unpadded, size in self.records:
+            index += _xz_varint(unpadded) + _xz_varint(size)
+        index += b'\000' * (-len(index) % 4)
+        index += struct.pack('<L', zlib.crc32(index) & 0xffffffff)
+        footer = struct.pack('<L', len(index) // 4 - 1) + self._flags
+        footer = struct.pack('<L', zlib.crc32(footer) & 0xffffffff) + footer
+        return index + footer + b'YZ'
+
+_zip64_limit = 0xffffffff
+
+def _zip_datetime(mtime, utc=False):
+    import time
+    t = time.gmtime(mtime) if utc else time.localtime(mtime)
+    if t[0] < 1980:
+        return 0, (1 << 5) | 1
+    return ((t[3] << 11) | (t[4] << 5) | (t[5] // 2),
+            ((t[0] - 1980) << 9) | (t[1] << 5) | t[2])
+
+def _zip_member(path, arcname, level, store=(), previous=None):
+    """Read (and deflate) the member ``path``; return its ``(info, data)``.
+    Members with suffixes listed in ``store``, incompressible members and
+    members which would not shrink are stored uncompressed. If ``previous``
+    (index of the previous archive) is given, members with unchanged content
+    are not compressed, ``data`` is ``None`` for them."""
+    import os
+    import stat
+    import zlib
+    st = os.stat(path)
+    info = {'name': arcname, 'mode': st.st_mode, 'mtime': st.st_mtime}
+    if stat.S_ISDIR(st.st_mode):
+        info.update(name=arcname.rstrip('/') + '/', method=0, crc=0, size=0)
+        return info, b''
+    with open(path, 'rb') as f:
+        data = f.read()
+    if previous is not None:
+        import hashlib
+        info['digest'] = hashlib.sha1(data).hexdigest()
+        try:
+            old = previous[arcname]
+        except KeyError:
+            pass
+        else:
+            if old['digest'] == info['digest']:
+                info.update(method=old['method'], crc=old['crc'],
+                            size=old['size'],
+                            reuse=(old['data_offset'], old['csize']))
+                return info, None
+    info.update(crc=zlib.crc32(data) & 0xffffffff, size=len(data), method=0)
+    if has_suffix(path, store) or is_incompressible(data):
+        return info, data
+    c = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    packed = c.compress(data) + c.flush()
+    if len(packed) >= len(data):
+        return info, data
+    info['method'] = 8
+    return info, packed
+
+class ZipWriter(object):
+    """Zip archive writer, which deflates members concurrently in a pool of
+    threads and writes them sequentially. ZIP64 extensions are used for
+    members, offsets and member counts exceeding the classic zip limits.
+    """
+
+    def __init__(self, fileobj, jobs=1, level=6, store=(), previous=None,
+                 source=None, epoch=None):
+        """If ``previous`` (index of previous archive, see ``index()``) and
+        ``source`` (the previous archive open for reading) are given, the
+        compressed data of unchanged members is copied from ``source``. If
+        ``epoch`` is given, the archive is reproducible - mtimes of members
+        are clamped to ``epoch`` (and stored as UTC), and their permissions
+        are normalized."""
+        self.fileobj = fileobj
+        self.epoch = epoch
+        self.jobs = jobs
+        self.level = level
+        self.store = tuple(store)
+        self.previous = previous
+        self.source = source
+        self.offset = 0
+        self.entries = []
+        self.reused = 0
+
+    def _write(self, data):
+        self.fileobj.write(data)
+        self.offset += len(data)
+
+    def write_member(self, info, data):
+        """Write the member described by ``info`` with (compressed)
+        ``data``"""
+        import struct
+        if data is None:
+            offset, size = info.pop('reuse')
+            self.source.seek(offset)
+            data = self.source.read(size)
+            self.reused += 1
+        name = info['name'].encode('utf-8')
+        info = dict(info, csize=len(data), offset=self.offset)
+        if self.epoch is not None:
+            isdir = info['name'].endswith('/')
+            info['mtime'] = min(info['mtime'], self.epoch)
+            info['mode'] = (info['mode'] & ~0o7777) \
+                         | _normal_mode(info['mode'], isdir)
+        extra = b''
+        sizes = (info['csize'], info['size'])
+        if max(sizes) >= _zip64_limit:
+            extra = struct.pack('<HHQQ', 1, 16, info['size'], info['csize'])
+            sizes = (0xffffffff, 0xffffffff)
+        info['version'] = 45 if extra or self.offset >= _zip64_limit else 20
+        dostime, dosdate = _zip_datetime(info['mtime'],
+                                          self.epoch is not None)
+        header = struct.pack('<LHHHHHLLLHH', 0x04034b50, info['version'],
+                             0x800, info['method'], dostime, dosdate,
+                             info['crc'], sizes[0], sizes[1], len(name),
+                             len(extra))
+        self._write(header + name + extra)
+        info['data_offset'] = self.offset
+        self._write(data)
+        self.entries.append(info)
+
+    def index(self):
+        """Return the index of members, to be used as ``previous`` when the
+        archive is rebuilt"""
+        keys = ('digest', 'data_offset', 'csize', 'size', 'crc', 'method')
+        return dict((info['name'], dict((k, info[k]) for k in keys))
+                    for info in self.entries if 'digest' in info)
+
+    def add(self, members):
+        """Compress and write ``members``, a sequence of ``(path, arcname)``
+        pairs, preserving their order"""
+        import collections
+        if self.jobs <= 1:
+            for path, arcname in members:
+                self.write_member(*_zip_member(path, arcname, self.level,
+                                               self.store, self.previous))
+            return
+        from multiprocessing.pool import ThreadPool
+        pool = ThreadPool(self.jobs)
+        try:
+            pending = collections.deque()
+            for path, arcname in members:
+                args = (path, arcname, self.level, self.store,
+                        self.previous)
+                pending.append(pool.apply_async(_zip_member, args))
+                while len(pending) > 2 * self.jobs:
+                    self.write_member(*pending.popleft().get())
+            while pending:
+                self.write_member(*pending.popleft().get())
+        finally:
+            pool.close()
+            pool.join()
+
+    def close(self):
+        import struct
+        start = self.offset
+        for info in self.entries:
+            name = info['name'].encode('utf-8')
+            fields = [info['csize'], info['size'], info['offset']]
+            zip64 = []
+            for i in (1, 0, 2):
+                if fields[i] >= _zip64_limit:
+                    zip64.append(fields[i])
+                    fields[i] = 0xffffffff
+            extra = b''
+            if zip64:
+                extra = struct.pack('<HH%dQ' % len(zip64), 1, 8 * len(zip64),
+                                    *zip64)
+            version = 45 if zip64 else info['version']
+            attr = (info['mode'] & 0xffff) << 16
+            if info['name'].endswith('/'):
+                attr |= 0x10
+            dostime, dosdate = _zip_datetime(info['mtime'],
+                                          self.epoch is not None)
+            header = struct.pack('<LHHHHHHLLLHHHHHLL', 0x02014b50,
+                                 (3 << 8) | version, version, 0x800,
+                                 info['method'], dostime, dosdate, info['crc'],
+                                 fields[0], fields[1], len(name), len(extra),
+                                 0, 0, 0, attr, fields[2])
+            self._write(header + name + extra)
+        count = len(self.entries)
+        size = self.offset - start
+        if count >= 0xffff or size >= _zip64_limit or start >= _zip64_limit:
+            end64 = self.offset
+            self._write(struct.pack('<LQHHLLQQQQ', 0x06064b50, 44, 45, 45, 0,
+                                    0, count, count, size, start))
+            self._write(struct.pack('<LLQL', 0x07064b50, 0, end64, 1))
+            count = min(count, 0xffff)
+            size = min(size, 0xffffffff)
+            start = min(start, 0xffffffff)
+        self._write(struct.pack('<LHHHHLLH', 0x06054b50, 0, 0, count, count,
+                                size, start, 0))
+
+def _zip_members(source, env):
+    """Expand directories in ``source``; return ``(path, arcname)`` pairs"""
+    import os
+    members = []
+    for src in map(str, source):
+        members.append((src, _arcname(src, env).lstrip('/')))
+        if not os.path.isdir(src):
+            continue
+        for root, dirs, files in os.walk(src):
+            dirs.sort()
+            for name in dirs + sorted(files):
+                path = os.path.join(root, name)
+                members.append((path, _arcname(path, env).lstrip('/')))
+    return members
+
+_index_version = 1
+
+def _load_index(path, params):
+    """Load the sidecar index of the archive ``path``; return the index of
+    members and the archive open for reading, or ``({}, None)`` if the index
+    is missing or does not match the archive"""
+    import os
+    import json
+    try:
+        with open(path + '.texasidx') as f:
+            index = json.load(f)
+        st = os.stat(path)
+    except (IOError, OSError, ValueError):
+        return {}, None
+    if index.get('version') != _index_version \
+            or index.get('params') != params \
+            or index.get('archive') != [st.st_size, st.st_mtime]:
+        return {}, None
+    return index['members'], open(path, 'rb')
+
+def _save_index(path, params, members):
+    import os
+    import json
+    st = os.stat(path)
+    index = {'version': _index_version, 'params': params,
+             'archive': [st.st_size, st.st_mtime], 'members': members}
+    tmp = path + '.texasidx.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(index, f, sort_keys=True)
+    if os.path.exists(path + '.texasidx') and not hasattr(os, 'replace'):
+        os.remove(path + '.texasidx')
+    getattr(os, 'replace', os.rename)(tmp, path + '.texasidx')
+
+def _tar_kwargs(env):
+    """Keyword arguments for ``tarfile.open()``, as in the archives tool"""
+    import tarfile
+    kwargs = {}
+    fmt = env.subst('$TARFILEFORMAT')
+    if fmt:
+        if not fmt.upper().endswith('_FORMAT'):
+            fmt = '%s_FORMAT' % fmt
+        kwargs['format'] = getattr(tarfile, fmt.upper())
+    if get_flag(env, 'TARFILEDEREFERENCE'):
+        kwargs['dereference'] = True
+    for k in ('encoding', 'errors'):
+        v = env.subst('$TARFILE%s' % k.upper())
+        if v:
+            kwargs[k] = v
+    return kwargs
+
+def _arcname(name, env):
+    import os
+    transform = env.get('TARFILETRANSFORM')
+    if transform and callable(transform):
+        return transform(name, env)
+    return '/'.join(name.split(os.path.sep))
+
+def _reproducible_epoch(env):
+    """Return the epoch of reproducible archive, ``None`` if the archive is
+    not reproducible"""
+    if not get_flag(env, 'TEXASREPRODUCIBLE'):
+        return None
+    epoch = env.subst('$TEXASSOURCEDATEEPOCH')
+    return int(epoch) if epoch else source_date_epoch(env)
+
+def _write_tar(target, source, env, writer, **kw):
+    import tarfile
+    source = list(map(str, source))
+    kwargs = _tar_kwargs(env)
+    epoch = _reproducible_epoch(env)
+    if epoch is None:
+        reset = None
+    else:
+        if get_flag(env, 'TEXASINCOMPRESSIBLELAST'):
+            suffixes = get_incompressible_suffixes(env)
+        else:
+            suffixes = ()
+        source.sort(key=lambda s: (has_suffix(s, suffixes), _arcname(s, env)))
+        kwargs.setdefault('format', tarfile.PAX_FORMAT)
+        reset = _reproducible_filter(epoch)
+    with open(str(target[0]), 'wb') as f:
+        out = writer(f, jobs=get_jobs(env, 'TEXASTARJOBS'), **kw)
+        try:
+            with tarfile.open(fileobj=out, mode='w|', **kwargs) as tar:
+                for src in source:
+                    tar.add(src, _arcname(src, env), filter=reset)
+        finally:
+            out.close()
+
+def Tar(target, source, env):
+    """Action creating uncompressed ``.tar`` archive"""
+    _write_tar(target, source, env, _StreamWriter)
+
+def TarBz2(target, source, env):
+    """Action creating ``.tar.bz2`` archive"""
+    import bz2
+    level = int(env.subst('$TARFILECOMPRESSLEVEL') or 9)
+    _write_tar(target, source, env, _StreamWriter,
+               compressor=bz2.BZ2Compressor(level))
+
+def TarGz(target, source, env):
+    """Action creating ``.tar.gz`` archive with block-parallel gzip"""
+    import os
+    level = int(env.subst('$TARFILECOMPRESSLEVEL') or 9)
+    name = os.path.basename(str(target[0]))
+    if name.endswith('.gz'):
+        name = name[:-3]
+    # Reproducible archives have zero timestamp in gzip header
+    mtime = None if _reproducible_epoch(env) is None else 0
+    _write_tar(target, source, env, GzipWriter, name=name, level=level,
+               mtime=mtime, block_size=_block_size(env),
+               store_incompressible=get_flag(env, 'TEXASINCOMPRESSIBLELAST'))
+
+def TarXz(target, source, env):
+    """Action creating ``.tar.xz`` archive with block-parallel xz"""
+    preset = int(env.subst('$TEXASXZPRESET') or 6)
+    size = 3 * _xz_dict_sizes[preset & 0xf]
+    _write_tar(target, source, env, XzWriter, preset=preset,
+               block_size=_block_size(env, size),
+               store_incompressible=get_flag(env, 'TEXASINCOMPRESSIBLELAST'))
+
+def Zip(target, source, env):
+    """Action creating ``.zip`` archive, members are deflated in parallel"""
+    import os
+    level = int(env.subst('$TEXASZIPLEVEL') or 6)
+    store = get_incompressible_suffixes(env)
+    jobs = get_jobs(env, 'TEXASZIPJOBS')
+    path = str(target[0])
+    epoch = _reproducible_epoch(env)
+    members = _zip_members(source, env)
+    if epoch is not None:
+        members.sort(key=lambda m: m[1])
+    if not get_flag(env, 'TEXASINCREMENTAL'):
+        with open(path, 'wb') as f:
+            out = ZipWriter(f, jobs, level, store, epoch=epoch)
+            out.add(members)
+            out.close()
+        return
+    # Incremental mode, the target is precious, so the previous archive is
+    # still there; the new one is written aside and renamed
+    params = {'level': level, 'store': list(store)}
+    previous, old = _load_index(path, params)
+    tmp = path + '.tmp'
+    try:
+        with open(tmp, 'wb') as f:
+            out = ZipWriter(f, jobs, level, store, previous, old, epoch)
+            out.add(members)
+            out.close()
+    finally:
+        if old is not None:
+            old.close()
+    if os.path.exists(path) and not hasattr(os, 'replace'):
+        os.remove(path)
+    getattr(os, 'replace', os.rename)(tmp, path)
+    _save_index(path, params, out.index())
+
+def _archive_str(name, var):
+    def strfunction(target, source, env):
+        return '%s(["%s"], ["%s"], jobs=%d)' % (name,
+            '", "'.join(map(str, target)), '", "'.join(map(str, source)),
+            get_jobs(env, var))
+    return strfunction
+
+def _create_builder(env, name, action, suffix, varlist, jobs='TEXASTARJOBS'):
+    import SCons.Action
+    import SCons.Builder
+    import SCons.Defaults
+    import SCons.Node.FS
+    try:
+        builder = env['BUILDERS'][name]
+    except KeyError:
+        action = SCons.Action.Action(action,
+                                     _archive_str(action.__name__, jobs),
+                                     varlist=['TARFILEFORMAT',
+                                              'TEXASARCHIVEBLOCKSIZE',
+                                              'TEXASINCOMPRESSIBLELAST',
+                                              'TEXASREPRODUCIBLE',
+                                              'TEXASSOURCEDATEEPOCH'] +
+                                             varlist)
+        scanner = SCons.Defaults.DirScanner
+        builder = SCons.Builder.Builder(action=action, suffix=suffix,
+                                        source_factory=SCons.Node.FS.Entry,
+                                        source_scanner=scanner, multi=1)
+        env['BUILDERS'][name] = builder
+    return builder
+
+def createTarBuilder(env):
+    """Return (and create, if necessary) the ``TeXASTarFile`` builder"""
+    return _create_builder(env, 'TeXASTarFile', Tar, '.tar', [])
+
+def createTarBz2Builder(env):
+    """Return (and create, if necessary) the ``TeXASTarBz2File`` builder"""
+    return _create_builder(env, 'TeXASTarBz2File', TarBz2, '.tar.bz2',
+                           ['TARFILECOMPRESSLEVEL'])
+
+def createTarGzBuilder(env):
+    """Return (and create, if necessary) the ``TeXASTarGzFile`` builder"""
+    return _create_builder(env, 'TeXASTarGzFile', TarGz, '.tar.gz',
+                           ['TARFILECOMPRESSLEVEL'])
+
+def createTarXzBuilder(env):
+    """Return (and create, if necessary) the ``TeXASTarXzFile`` builder"""
+    return _create_builder(env, 'TeXASTarXzFile', TarXz, '.tar.xz',
+                           ['TEXASXZPRESET'])
+
+def createZipBuilder(env):
+    """Return (and create, if necessary) the ``TeXASZipFile`` builder"""
+    return _create_builder(env, 'TeXASZipFile', Zip, '.zip',
+                           ['TEXASZIPLEVEL', 'TEXASINCOMPRESSIBLESUFFIXES',
+                            'TEXASINCREMENTAL'],
+                           'TEXASZIPJOBS')
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -31,6 +31,7 @@ __docformat__ = "restructuredText"
 keywords = [
     'alias',
     'alias_suffix',
+    'always_build',
     'default_alias_suffix',
     'default_suffix',
     'out_dir',
@@ -39,92 +40,213 @@ keywords = [
     'version',
 ]
 
+def _arg2nodes(env, nodes, *args, **kw):
+    """Same as ``env.arg2nodes()``, but returns lists consisting of nodes
+    only as they are, without passing them through ``env.arg2nodes()``;
+    this includes ``NodeList`` objects returned by builders"""
+    import SCons.Node
+    import SCons.Util
+    if isinstance(nodes, (list, tuple, SCons.Util.UserList)):
+        Node = SCons.Node.Node
+        for n in nodes:
+            if not isinstance(n, Node):
+                break
+        else:
+            return nodes
+    return env.arg2nodes(nodes, *args, **kw)
+
+def _rmdup(nodes, seen):
+    """Return nodes from ``nodes`` not found in ``seen``, without duplicates.
+    The returned nodes are added to ``seen``."""
+    seen_add = seen.add
+    return [n for n in nodes if not (n in seen or seen_add(n))]
+
 def RmDup(env, nodes, *args, **kw):
     """Remove duplicates from list ``nodes``, while preserving order"""
-    result = []
-    seen = set()
-    nodes = env.arg2nodes(nodes, *args, **kw)
-    for n in nodes:
-        if not n in seen:
-            result.append(n)
-            seen.add(n)
-    return result
+    return _rmdup(_arg2nodes(env, nodes, *args, **kw), set())
 
-def Children(env, node):
-    node = env.arg2nodes(node, env.fs.Entry)[0]
+def RmDupAll(env, lists, *args, **kw):
+    """Remove duplicates from several lists of nodes at once, while preserving
+    order.
 
-    children = []
-    def select_files(ss):
-        import SCons.Node
-        for s in ss:
-            if isinstance(s, SCons.Node.FS.Dir):
-                select_files(s.all_children())
-            elif isinstance(s.disambiguate(), SCons.Node.FS.File):
-                children.append(s)
+    :Parameters:
+        env
+            the SCons construction environment,
+        lists
+            a list of lists of nodes; ``*args`` and ``**kw`` are passed to
+            ``env.arg2nodes()`` (for lists that contain non-node entries).
 
-    select_files(node.all_children())
+    :Returns:
+        a list of lists, one per list in ``lists``; a node is retained only
+        at its first occurrence, so the returned lists are disjoint and their
+        concatenation equals ``RmDup(env, sum(lists, []))``.
+    """
+    seen = set()
+    return [_rmdup(_arg2nodes(env, nodes, *args, **kw), seen)
+            for nodes in lists]
+
+_children_memo = {}
+_children_results = {}
+
+def _children_sig(node):
+    """Return a cheap signature of the list of ``node``'s children - the
+    lists of its sources, dependencies and implicit dependencies, and their
+    lengths. SCons appends to these lists, or replaces them (e.g. when
+    re-scanning implicit dependencies), so comparing the lists by identity
+    and their lengths by value tells whether the children have changed."""
+    implicit = node.implicit
+    return (node.sources, node.depends, implicit,
+            len(node.sources), len(node.depends), len(implicit or ()))
+
+def _children_valid(sig, node):
+    """Check whether signature ``sig`` is still valid for ``node``"""
+    new = _children_sig(node)
+    return sig[0] is new[0] and sig[1] is new[1] and sig[2] is new[2] \
+        and sig[3:] == new[3:]
+
+def _children_entries(node):
+    """Return file and directory children of ``node``, memoized as long as
+    the list of ``node``'s children is unchanged."""
+    import SCons.Node.FS
+    try:
+        sig, entries = _children_memo[node]
+    except KeyError:
+        pass
+    else:
+        if _children_valid(sig, node):
+            return entries
+    entries = []
+    for c in node.all_children():
+        c = c.disambiguate()
+        if isinstance(c, (SCons.Node.FS.Dir, SCons.Node.FS.File)):
+            entries.append(c)
+    _children_memo[node] = (_children_sig(node), entries)
+    return entries
 
-    return RmDup(env, children)
+def Children(env, node):
+    """Return all files reachable from ``node`` (through its children and
+    recursively through child directories), without duplicates.
+
+    The traversal is iterative. The file and directory children of visited
+    nodes are memoized (per node) and reused by subsequent calls, as long as
+    the lists of children of the nodes in question have not changed. The
+    result is memoized as well, and returned again while none of the nodes
+    visited to compute it has changed.
+    """
+    import SCons.Node.FS
+    node = env.arg2nodes(node, env.fs.Entry)[0]
 
+    try:
+        sigs, files = _children_results[node]
+    except KeyError:
+        pass
+    else:
+        if all(_children_valid(sig, n) for n, sig in sigs):
+            return list(files)
 
-def ImportFromTDS(env, source, **kw):
-    """Import a file from TeX Directory Structure
+    files = []
+    seen = set()
+    visited = set([node])
+    sigs = []
+    stack = [iter(_children_entries(node))]
+    sigs.append((node, _children_memo[node][0]))
+    while stack:
+        for c in stack[-1]:
+            if isinstance(c, SCons.Node.FS.Dir):
+                if c not in visited:
+                    visited.add(c)
+                    stack.append(iter(_children_entries(c)))
+                    sigs.append((c, _children_memo[c][0]))
+                    break
+            elif c not in seen:
+                seen.add(c)
+                files.append(c)
+        else:
+            stack.pop()
+    _children_results[node] = (sigs, files)
+    return list(files)
 
-    Use ``kpsewhich`` to search for source files within TeX Directory Structure
-    (TDS) and copy them to the target directory ``out_dir``.
 
-    Note: in addition to arguments documented here, this method accepts all
-    keyword parameters recognized by ``env.KPSShowPath()`` and
-    ``env.KPSFindFiles()``. See documentation of ``kpsewhich tool``.
+def _children_filter(patterns):
+    """Return a predicate telling whether a node matches any of (glob)
+    ``patterns``; the patterns are tried against node's path (with ``/`` as
+    a separator) and name"""
+    import os
+    import fnmatch
+    import SCons.Util
+    if not patterns:
+        return lambda node: False
+    if SCons.Util.is_String(patterns):
+        patterns = [patterns]
+    patterns = list(patterns)
+    def matches(node):
+        path = '/'.join(str(node).split(os.path.sep))
+        for p in patterns:
+            if fnmatch.fnmatchcase(path, p) or fnmatch.fnmatchcase(node.name, p):
+                return True
+        return False
+    return matches
+
+def IterChildren(env, node, suffixes=None, exclude=None, max_depth=None):
+    """Generate files reachable from ``node``, as ``Children()`` does, but
+    lazily, filtering the files during the traversal.
 
     :Parameters:
-
-        source
-            (a list of) file(s) to be imported
-
-    :Keywords:
-        out_dir
-            where to import files to, defaults to '.'
+        env
+            the SCons construction environment,
+        node
+            the node (or name of the node) to start from,
+        suffixes
+            (optional) suffix or list of suffixes of files to be generated,
+        exclude
+            (optional) glob pattern or list of patterns; matching files are
+            skipped, matching directories are not entered,
+        max_depth
+            (optional) how many levels of directories to enter; with
+            ``max_depth=0`` only the files being direct children of ``node``
+            are generated.
 
     :Returns:
-        list of nodes created in the target directory.
+        generator of file nodes, without duplicates, in the same order as
+        they appear in the list returned by ``Children()``.
     """
     import SCons.Util
-    import SCons.Script
-    import SCons.Errors
-    import re
-    import platform
+    import SCons.Node.FS
 
-    if not SCons.Util.is_Sequence(source): source = [source]
-    source = [ env.subst(str(f)) for f in source ]
-
-    try: out_dir = kw['out_dir']
-    except KeyError: out_dir = env.Dir('.')
-
-    found = {}
-    for f in source:
-        suffix = SCons.Util.silent_intern(SCons.Util.splitext(f)[1])
-        if suffix:
-            kw['path'] = env.KPSShowPath(suffix, **kw)
-            # Remove all '.' (CWD) dir entries
-            if platform.system() == 'Windows':
-                kw['path'] = re.sub(r'(?:^\.[\\/]*;|;\.[\\/]*$)', r'', kw['path'])
-                kw['path'] = re.sub(r';\.[\\/]*;',r';', kw['path'])
-            else:
-                kw['path'] = re.sub(r'(?:^\./*:|:\./*$)', r'', kw['path'])
-                kw['path'] = re.sub(r':\./*:',r':', kw['path'])
-            # Find the file in TDS
-            found[f] = env.KPSFindFiles(f, **kw)
-        else:
-            raise SCons.Errors.UserError( "Can't import file '%s' " \
-                                        + "which has no suffix." % f)
-    target = []
-    for dname, sname in found.items():
-        dst = env.File(dname, out_dir)
-        t = env.Command(dst, sname, SCons.Script.Copy('$TARGET', '$SOURCE'))
-        target.extend(t)
+    node = env.arg2nodes(node, env.fs.Entry)[0]
+    if SCons.Util.is_String(suffixes):
+        suffixes = [suffixes]
+    if suffixes is not None:
+        suffixes = tuple(suffixes)
+    excluded = _children_filter(exclude)
 
-    return target
+    seen = set()
+    # directory -> the lowest level its children were walked at
+    walked = {}
+    stack = [(iter(node.all_children()), 0)]
+    while stack:
+        it, level = stack[-1]
+        for c in it:
+            c = c.disambiguate()
+            if isinstance(c, SCons.Node.FS.Dir):
+                if max_depth is not None and level >= max_depth:
+                    continue
+                if walked.get(c, level + 2) <= level + 1 or excluded(c):
+                    continue
+                walked[c] = level + 1
+                stack.append((iter(c.all_children()), level + 1))
+                break
+            elif isinstance(c, SCons.Node.FS.File):
+                if c in seen:
+                    continue
+                if suffixes is not None and not c.name.endswith(suffixes):
+                    continue
+                if excluded(c):
+                    continue
+                seen.add(c)
+                yield c
+        else:
+            stack.pop()
 
 def del_keys(dict_,keys):
     for k in keys:
@@ -282,6 +404,48 @@ def get_auto_alias(name, alias_kw, **kw):
             alias = name
     return alias
 
+def get_always_build(env, **kw):
+    """Tell whether the automatic aliases shall be always built.
+
+    :Parameters:
+        env
+            the SCons Environment object
+    :Keywords:
+        always_build
+            (optional) if true, the alias is built on every invocation,
+            otherwise only when its targets are out of date; the default is
+            taken from the ``$TEXASALWAYSBUILD`` construction variable, or
+            ``True`` if it's not set; strings such as ``'0'`` or ``'no'`` are
+            false (see `TeXASArchive.is_true()`)
+    :Returns:
+        boolean
+    """
+    from . import TeXASArchive
+    return TeXASArchive.get_flag(env, 'TEXASALWAYSBUILD', 'always_build',
+                                 True, **kw)
+
+def declare_alias(env, alias, target, **kw):
+    """Declare ``alias`` for ``target`` and, depending on ``always_build``
+    (see `get_always_build()`), mark it as always built.
+
+    :Parameters:
+        env
+            the SCons Environment object
+        alias
+            name of the alias (string),
+        target
+            nodes to be aliased
+    :Keywords:
+        always_build
+            see `get_always_build()`
+    :Returns:
+        the alias node(s)
+    """
+    nodes = env.Alias(alias, target)
+    if get_always_build(env, **kw):
+        env.AlwaysBuild(nodes)
+    return nodes
+
 def get_strip_dirs(env, **kw):
     """Prepare list of directory nodes to be stripped from the beginning of
     file names.
@@ -322,6 +486,60 @@ def get_strip_dirs(env, **kw):
             dirs2.append(s)
     return dirs2
 
+def _split_path(path):
+    import re
+    import os
+    return re.split(r'[%s]+' % re.escape(os.path.sep + '/'), path)
+
+class StripDirsTrie(object):
+    """Strips leading directories from file paths, as ``TARFILEMAPPINGS``
+    with a list of directories does, but in time proportional to the path
+    depth, independently of the number of directories.
+
+    The directories are kept as nodes and converted to strings when the
+    first path is being stripped (at build time), so the instance may be
+    passed as ``TARFILETRANSFORM`` to the ``TarFile`` builder. If several
+    directories match, the first one in ``dirs`` wins.
+    """
+    def __init__(self, dirs):
+        self.dirs = list(dirs)
+        self._root = None
+
+    def _compile(self):
+        import os
+        root = {}
+        for i, d in enumerate(self.dirs):
+            node = root
+            for c in _split_path(str(d).rstrip('/' + os.sep)):
+                node = node.setdefault(c, {})
+            node.setdefault(None, i)
+        return root
+
+    def strip(self, path):
+        """Return ``path`` (with ``/`` separators) without the leading
+        directory to be stripped out"""
+        if self._root is None:
+            self._root = self._compile()
+        comps = _split_path(path)
+        node = self._root
+        best = None
+        for depth, c in enumerate(comps):
+            node = node.get(c)
+            if node is None:
+                break
+            try:
+                i = node[None]
+            except KeyError:
+                continue
+            if (best is None or i < best[0]) and '/'.join(comps[depth+1:]):
+                best = (i, depth + 1)
+        if best is not None:
+            comps = comps[best[1]:]
+        return '/'.join(comps)
+
+    def __call__(self, name, env):
+        return self.strip(name)
+
 def joinpathre(dirs):
     import re
     import platform
@@ -28,8 +28,14 @@ Utility functions for packaging and distribution of sources.
 __docformat__ = "restructuredText"
 
 from . import TeXASCommon
+from . import TeXASArchive
 
 _local_keywords = TeXASCommon.keywords + [
+    'incompressible_last',
+    'incremental',
+    'jobs',
+    'preset',
+    'reproducible',
     'strip_dirs'
 ]
 
@@ -37,8 +43,17 @@ def _del_local_keywords(kw):
     global _local_keywords
     return TeXASCommon.del_keys(kw, _local_keywords)
 
-def _tar(env, name, source, **kw):
-    """Core of the `Tar()`, `TarGz()` and `TarBz2()`"""
+def _incompressible_last(env, **kw):
+    return TeXASArchive.get_flag(env, 'TEXASINCOMPRESSIBLELAST',
+                                 'incompressible_last', **kw)
+
+def _reproducible(env, **kw):
+    return TeXASArchive.get_flag(env, 'TEXASREPRODUCIBLE', 'reproducible',
+                                 **kw)
+
+def _tar(env, name, source, create=None, **kw):
+    """Core of the `Tar()`, `TarGz()`, `TarBz2()`, `TarXz()` and `Zip()`;
+    ``create`` returns the builder to be used instead of the ``TarFile`` one"""
     import SCons.Util
     import platform
 
@@ -48,11 +63,33 @@ def _tar(env, name, source, **kw):
     # Some paths are stripped from file names in the archive
     dirs2strip = TeXASCommon.get_strip_dirs(env, **kw)
 
-    target = env.TarFile(target, source, TARFILEMAPPINGS=dirs2strip, **kw)
+    transform = TeXASCommon.StripDirsTrie(dirs2strip)
+
+    if _incompressible_last(env, **kw):
+        suffixes = TeXASArchive.get_incompressible_suffixes(env)
+        source = TeXASArchive.group_incompressible(source, suffixes)
+        kw['TEXASINCOMPRESSIBLELAST'] = True
+
+    if _reproducible(env, **kw):
+        kw['TEXASREPRODUCIBLE'] = True
+        kw['TEXASSOURCEDATEEPOCH'] = TeXASArchive.source_date_epoch(env)
+
+    always_build = TeXASCommon.get_always_build(env, **kw)
+    kw.pop('always_build', None)
+    kw.pop('incompressible_last', None)
+    kw.pop('incremental', None)
+    kw.pop('jobs', None)
+    kw.pop('preset', None)
+    kw.pop('reproducible', None)
+    if create is None:
+        target = env.TarFile(target, source, TARFILETRANSFORM=transform, **kw)
+    else:
+        builder = create(env)
+        target = builder(env, target, source, TARFILETRANSFORM=transform, **kw)
 
     if alias:
-        env.Alias(alias, target)
-        env.AlwaysBuild(alias)
+        TeXASCommon.declare_alias(env, alias, target,
+                                  always_build=always_build)
     return target
 
 def Tar(env, name, source, **kw):
@@ -90,8 +127,22 @@ def Tar(env, name, source, **kw):
             create any alias set ``alias=None``
         alias_suffix
             alias suffix to be used instead of the default ``tar`` alias suffix
+        always_build
+            if true (default), the alias is built on every invocation of
+            **scons**, otherwise only when the archive is out of date; the
+            default may be changed with ``$TEXASALWAYSBUILD``,
+        incompressible_last
+            if ``True``, source files with suffixes listed in
+            ``$TEXASINCOMPRESSIBLESUFFIXES`` (``.pdf``, ``.png``, ``.gz``,
+            etc.) are placed at the end of the archive, by default the
+            ``$TEXASINCOMPRESSIBLELAST`` construction variable is used
         out_dir
             output directory, where to create the archive
+        reproducible
+            if ``True``, the archive is reproducible - members are sorted,
+            their mtimes are clamped to ``SOURCE_DATE_EPOCH`` (1980-01-01 if
+            not set), ownership and permissions are normalized, by default
+            the ``$TEXASREPRODUCIBLE`` construction variable is used
         strip_dirs
             directories to strip out from the paths of files in the archive,
             for example if ``source = ["sub1/foo.txt", "sub2/bar.txt",
@@ -115,6 +166,8 @@ def Tar(env, name, source, **kw):
     kw['default_alias_suffix'] = 'tar'
     kw['default_suffix'] = kw.get('TARFILESUFFIX',
                                   env.subst('$TARFILESUFFIX') or '.tar')
+    if _reproducible(env, **kw):
+        return _tar(env, name, source, TeXASArchive.createTarBuilder, **kw)
     return _tar(env, name, source, **kw)
 
 def TarGz(env, name, source, **kw):
@@ -152,8 +205,31 @@ def TarGz(env, name, source, **kw):
             create any alias set ``alias=None``
         alias_suffix
             alias suffix to be used instead of the default ``tgz`` alias suffix
+        always_build
+            if true (default), the alias is built on every invocation of
+            **scons**, otherwise only when the archive is out of date; the
+            default may be changed with ``$TEXASALWAYSBUILD``,
+        incompressible_last
+            if ``True``, source files with suffixes listed in
+            ``$TEXASINCOMPRESSIBLESUFFIXES`` (``.pdf``, ``.png``, ``.gz``,
+            etc.) are placed at the end of the archive, and blocks of
+            incompressible data are stored instead of being compressed, by
+            default the ``$TEXASINCOMPRESSIBLELAST`` construction variable is
+            used
+        jobs
+            number of threads compressing the archive, by default the
+            ``$TEXASTARJOBS`` construction variable is used, or ``1`` if
+            ``$TEXASTARJOBS`` is not set; with more than one job, the data is
+            compressed in independent blocks of ``$TEXASARCHIVEBLOCKSIZE``
+            bytes, ``0`` means one job per CPU
         out_dir
             output directory, where to create the archive
+        reproducible
+            if ``True``, the archive is reproducible - members are sorted,
+            their mtimes are clamped to ``SOURCE_DATE_EPOCH`` (1980-01-01 if
+            not set), ownership and permissions are normalized and the gzip
+            header has zero timestamp, by default the ``$TEXASREPRODUCIBLE``
+            construction variable is used
         strip_dirs
             directories to strip out from the paths of files in the archive,
             for example if ``source = ["sub1/foo.txt", "sub2/bar.txt",
@@ -161,7 +237,6 @@ def TarGz(env, name, source, **kw):
             resulting archive will contain files ``foo.txt``, ``sub2/bar.txt``
             and ``geez.txt``, you may also set ``strip_dirs=True`` to strip
             out the current working directory
-
         suffix
             suffix for the target file, by default ``.tar.gz`` is used
         target
@@ -175,6 +250,11 @@ def TarGz(env, name, source, **kw):
     kw['default_alias_suffix'] = 'tgz'
     kw['default_suffix'] = '.tar.gz'
     kw['TARFILEMODE'] = 'w:gz'
+    jobs = TeXASArchive.get_jobs(env, 'TEXASTARJOBS', **kw)
+    if jobs > 1 or _incompressible_last(env, **kw) \
+            or _reproducible(env, **kw):
+        kw['TEXASTARJOBS'] = jobs
+        return _tar(env, name, source, TeXASArchive.createTarGzBuilder, **kw)
     return _tar(env, name, source, **kw)
 
 def TarBz2(env, name, source, **kw):
@@ -212,8 +292,22 @@ def TarBz2(env, name, source, **kw):
             create any alias set ``alias=None``
         alias_suffix
             alias suffix to be used instead of the default ``tbz2`` alias suffix
+        always_build
+            if true (default), the alias is built on every invocation of
+            **scons**, otherwise only when the archive is out of date; the
+            default may be changed with ``$TEXASALWAYSBUILD``,
+        incompressible_last
+            if ``True``, source files with suffixes listed in
+            ``$TEXASINCOMPRESSIBLESUFFIXES`` (``.pdf``, ``.png``, ``.gz``,
+            etc.) are placed at the end of the archive, by default the
+            ``$TEXASINCOMPRESSIBLELAST`` construction variable is used
         out_dir
             output directory, where to create the archive
+        reproducible
+            if ``True``, the archive is reproducible - members are sorted,
+            their mtimes are clamped to ``SOURCE_DATE_EPOCH`` (1980-01-01 if
+            not set), ownership and permissions are normalized, by default
+            the ``$TEXASREPRODUCIBLE`` construction variable is used
         strip_dirs
             directories to strip out from the paths of files in the archive,
             for example if ``source = ["sub1/foo.txt", "sub2/bar.txt",
@@ -234,8 +328,201 @@ def TarBz2(env, name, source, **kw):
     kw['default_alias_suffix'] = 'tbz2'
     kw['default_suffix'] = '.tar.bz2'
     kw['TARFILEMODE'] = 'w:bz2'
+    if _reproducible(env, **kw):
+        return _tar(env, name, source, TeXASArchive.createTarBz2Builder, **kw)
     return _tar(env, name, source, **kw)
 
+def TarXz(env, name, source, **kw):
+    """Create xz-compressed tar archive from source(s).
+
+    This function creates xz-compressed TAR archive containing files listed
+    in the ``source`` argument. The target file name may be fixed with the
+    ``target`` argument.  Otherwise, the ``out_dir``, ``name``, ``version``
+    and ``suffix`` are used to compose the target file path - the created
+    archive file is ``[<out_dir>/]<name>[-<version>].tar.xz`` (``[]`` means
+    optional part and ``<>`` stands for argument substitution).  The target
+    file extension might be changed with the ``suffix`` argument. The function
+    also auto-generates the alias for this target, so user can build the
+    archive with **scons <alias>**. To change the alias, provide an
+    alternative with ``alias`` argument. If you don't wish the alias to be
+    created at all, set ``alias=None``.
+
+    The archive is compressed in independent xz blocks (multi-block
+    ``.xz``), which may be compressed (and decompressed) in parallel.
+
+    Certain leading paths can be stripped out from file names during package
+    creation. These paths are provided with the ``strip_dirs`` argument.
+
+    :Parameters:
+
+        env
+            the SCons Environment object
+        name
+            package name (string)
+        source
+            source files to be included in the archive
+
+    :Keywords:
+        alias
+            SCons alias for this target, if not provided the default alias
+            ``<name>-txz`` or ``<name>-<alias_suffix>`` is used,
+            otherwise the alias is set to the value of this argument; to not
+            create any alias set ``alias=None``
+        alias_suffix
+            alias suffix to be used instead of the default ``txz`` alias suffix
+        always_build
+            if true (default), the alias is built on every invocation of
+            **scons**, otherwise only when the archive is out of date; the
+            default may be changed with ``$TEXASALWAYSBUILD``,
+        incompressible_last
+            if ``True``, source files with suffixes listed in
+            ``$TEXASINCOMPRESSIBLESUFFIXES`` (``.pdf``, ``.png``, ``.gz``,
+            etc.) are placed at the end of the archive, and blocks of
+            incompressible data are stored instead of being compressed, by
+            default the ``$TEXASINCOMPRESSIBLELAST`` construction variable is
+            used
+        jobs
+            number of threads compressing the archive, by default the
+            ``$TEXASTARJOBS`` construction variable is used, or ``1`` if
+            ``$TEXASTARJOBS`` is not set, ``0`` means one job per CPU
+        out_dir
+            output directory, where to create the archive
+        preset
+            xz compression preset (``0`` to ``9``, optionally or-ed with
+            ``lzma.PRESET_EXTREME``), by default the ``$TEXASXZPRESET``
+            construction variable is used, or ``6`` if ``$TEXASXZPRESET`` is
+            not set
+        reproducible
+            if ``True``, the archive is reproducible - members are sorted,
+            their mtimes are clamped to ``SOURCE_DATE_EPOCH`` (1980-01-01 if
+            not set), ownership and permissions are normalized, by default
+            the ``$TEXASREPRODUCIBLE`` construction variable is used
+        strip_dirs
+            directories to strip out from the paths of files in the archive,
+            for example if ``source = ["sub1/foo.txt", "sub2/bar.txt",
+            "sub3/geez.txt"]`` and ``strip_dirs = ["sub1", "sub3"]``, the
+            resulting archive will contain files ``foo.txt``, ``sub2/bar.txt``
+            and ``geez.txt``, you may also set ``strip_dirs=True`` to strip
+            out the current working directory
+        suffix
+            suffix for the target file, by default ``.tar.xz`` is used
+        target
+            target file name to use instead of the default auto-generated name
+        version
+            version of the package, used to generate the name of target file
+    :Returns:
+        a list of targets created (single target actually)
+    """
+    import SCons.Errors
+    try:
+        import lzma
+    except ImportError:
+        raise SCons.Errors.UserError('TeXASTarXz requires the lzma module')
+
+    kw['default_alias_suffix'] = 'txz'
+    kw['default_suffix'] = '.tar.xz'
+    kw['TEXASTARJOBS'] = TeXASArchive.get_jobs(env, 'TEXASTARJOBS', **kw)
+    try: preset = kw['preset']
+    except KeyError: preset = env.subst('$TEXASXZPRESET') or 6
+    try:
+        valid = 0 <= (int(preset) & ~lzma.PRESET_EXTREME) <= 9
+    except (TypeError, ValueError):
+        valid = False
+    if not valid:
+        raise SCons.Errors.UserError('TeXASTarXz: invalid preset %r' % preset)
+    if 'preset' in kw:
+        kw['TEXASXZPRESET'] = int(preset)
+    return _tar(env, name, source, TeXASArchive.createTarXzBuilder, **kw)
+
+def Zip(env, name, source, **kw):
+    """Create zip archive from source(s).
+
+    This function creates ZIP archive containing files listed in the
+    ``source`` argument (directories are added recursively). The target file
+    name may be fixed with the ``target`` argument.  Otherwise, the
+    ``out_dir``, ``name``, ``version`` and ``suffix`` are used to compose the
+    target file path - the created archive file is
+    ``[<out_dir>/]<name>[-<version>].zip`` (``[]`` means optional part and
+    ``<>`` stands for argument substitution).  The target file extension
+    might be changed with the ``suffix`` argument (for example
+    ``suffix='.tds.zip'``). The function also auto-generates the alias for
+    this target, so user can build the archive with **scons <alias>**. To
+    change the alias, provide an alternative with ``alias`` argument. If you
+    don't wish the alias to be created at all, set ``alias=None``.
+
+    The members are deflated concurrently and written sequentially; ZIP64
+    extensions are used when the archive outgrows the classic zip format.
+
+    Certain leading paths can be stripped out from file names during package
+    creation. These paths are provided with the ``strip_dirs`` argument.
+
+    :Parameters:
+
+        env
+            the SCons Environment object
+        name
+            package name (string)
+        source
+            source files to be included in the archive
+
+    :Keywords:
+        alias
+            SCons alias for this target, if not provided the default alias
+            ``<name>-zip`` or ``<name>-<alias_suffix>`` is used,
+            otherwise the alias is set to the value of this argument; to not
+            create any alias set ``alias=None``
+        alias_suffix
+            alias suffix to be used instead of the default ``zip`` alias suffix
+        always_build
+            if true (default), the alias is built on every invocation of
+            **scons**, otherwise only when the archive is out of date; the
+            default may be changed with ``$TEXASALWAYSBUILD``,
+        incremental
+            if ``True``, the archive is rebuilt incrementally - a sidecar
+            index ``<target>.texasidx`` with content hashes of members is
+            kept next to the (precious) archive, and the compressed data of
+            unchanged members is copied verbatim from the previous archive,
+            by default the ``$TEXASINCREMENTAL`` construction variable is used
+        jobs
+            number of threads compressing the members, by default the
+            ``$TEXASZIPJOBS`` construction variable is used, or ``1`` if
+            ``$TEXASZIPJOBS`` is not set, ``0`` means one job per CPU
+        out_dir
+            output directory, where to create the archive
+        reproducible
+            if ``True``, the archive is reproducible - members are sorted,
+            their mtimes are clamped to ``SOURCE_DATE_EPOCH`` (1980-01-01 if
+            not set), ownership and permissions are normalized, by default
+            the ``$TEXASREPRODUCIBLE`` construction variable is used
+        strip_dirs
+            directories to strip out from the paths of files in the archive,
+            for example if ``source = ["sub1/foo.txt", "sub2/bar.txt",
+            "sub3/geez.txt"]`` and ``strip_dirs = ["sub1", "sub3"]``, the
+            resulting archive will contain files ``foo.txt``, ``sub2/bar.txt``
+            and ``geez.txt``, you may also set ``strip_dirs=True`` to strip
+            out the current working directory
+        suffix
+            suffix for the target file, by default ``.zip`` is used
+        target
+            target file name to use instead of the default auto-generated name
+        version
+            version of the package, used to generate the name of target file
+    :Returns:
+        a list of targets created (single target actually)
+    """
+
+    kw['default_alias_suffix'] = 'zip'
+    kw['default_suffix'] = '.zip'
+    kw['TEXASZIPJOBS'] = TeXASArchive.get_jobs(env, 'TEXASZIPJOBS', **kw)
+    incremental = TeXASArchive.get_flag(env, 'TEXASINCREMENTAL',
+                                        'incremental', **kw)
+    kw['TEXASINCREMENTAL'] = incremental
+    target = _tar(env, name, source, TeXASArchive.createZipBuilder, **kw)
+    if incremental:
+        env.Precious(target)
+        env.Clean(target, [str(t) + '.texasidx' for t in target])
+    return target
+
 # Local Variables:
 # # tab-width:4
 # # indent-tabs-mode:nil
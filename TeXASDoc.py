@@ -41,7 +41,24 @@ def _del_local_keywords(kw):
     global _local_keywords
     return TeXASCommon.del_keys(kw, _local_keywords)
 
-def _builddoc(env, name, source=_null, **kw):
+def _doc_defaults(env, builder, **kw):
+    """Return default target and alias suffixes for ``builder``"""
+    import SCons.Errors
+    if builder == 'DVI':
+        # Suffixes are fixed for DVI builder
+        return {'default_alias_suffix': 'dvi', 'default_suffix': '.dvi'}
+    elif builder == 'PDF':
+        try: suffix = kw['PDFSUFFIX']
+        except KeyError: suffix = env.subst('$PDFSUFFIX') or '.pdf'
+    elif builder == 'DVIPDFM':
+        try: suffix = kw['DVIPDFMSUFFIX']
+        except KeyError: suffix = env.subst('$DVIPDFMSUFFIX') or '.pdf'
+    else:
+        raise SCons.Errors.UserError('Unsupported builder: %r' % repr(builder))
+    return {'default_alias_suffix': 'pdf', 'default_suffix': suffix}
+
+def _declaredoc(env, name, source=_null, **kw):
+    """Declare the document target, return the target and its alias"""
     import SCons.Errors
     try: builder = kw['builder']
     except KeyError: builder = 'DVI'
@@ -72,9 +89,14 @@ def _builddoc(env, name, source=_null, **kw):
         if deps: env.Depends(target, deps)
     else:
         raise SCons.Errors.UserError('Unsupported builder: %r' % builder)
+    return target, alias
+
+def _builddoc(env, name, source=_null, **kw):
+    target, alias = _declaredoc(env, name, source, **kw)
     if alias:
-        env.Alias(alias, target)
-        env.AlwaysBuild(alias)
+        always_build = TeXASCommon.get_always_build(env, **kw)
+        TeXASCommon.declare_alias(env, alias, target,
+                                  always_build=always_build)
     return target
 
 def Doc(env, name, source=_null, **kw):
@@ -95,6 +117,10 @@ def Doc(env, name, source=_null, **kw):
             create any alias set ``alias=None``,
         alias_suffix
             alias suffix to be used instead of the default ``dvi`` alias suffix,
+        always_build
+            if true (default), the alias is built on every invocation of
+            **scons**, otherwise only when its targets are out of date; the
+            default may be changed with ``$TEXASALWAYSBUILD``,
         builder
             string - name of the builder used to create target, currently
             supported values are ``'DVI'``, ``'PDF'`` and ``'DVIPDFM'``,
@@ -111,32 +137,91 @@ def Doc(env, name, source=_null, **kw):
     :Returns:
         a list of targets created (single target actually)
     """
+    if 'builder' not in kw:
+        kw['builder'] = 'DVI'
+    kw.update(_doc_defaults(env, **kw))
+    return _builddoc(env, name, source, **kw)
+
+_docs_columns = ('name', 'source', 'version', 'out_dir', 'builder')
+
+def _docs_row(spec, **kw):
+    """Convert single row of ``Docs()`` table to ``(name, source, kw)``"""
+    import SCons.Util
     import SCons.Errors
+    if SCons.Util.is_Dict(spec):
+        kw.update(spec)
+    else:
+        for key, value in zip(_docs_columns, spec):
+            if value is not None:
+                kw[key] = value
+    try: name = kw.pop('name')
+    except KeyError:
+        msg = "TeXASDocs: row %r has no 'name'" % (spec,)
+        raise SCons.Errors.UserError(msg)
+    source = kw.pop('source', _null)
+    return name, source, kw
+
+def Docs(env, specs, **kw):
+    """Declare many documents at once, as if ``Doc()`` was called for each
+    row of ``specs``.
+
+    The output directories, default suffixes and aliases are resolved once
+    for all the rows sharing them, which speeds up the declaration of large
+    catalogues of documents.
+
+    :Parameters:
+        env
+            the SCons Environment object
+        specs
+            a sequence of rows, each row is either a tuple ``(name, source,
+            version, out_dir, builder)`` (trailing items may be omitted, items
+            set to ``None`` are ignored) or a dict of keyword arguments of
+            ``Doc()`` including ``name`` and, optionally, ``source``
+    :Keywords:
+        same as for ``Doc()``, used as defaults for all the rows
+    :Returns:
+        a list of targets created (one per row)
+    """
+    import SCons.Node.FS
     if 'builder' not in kw:
         kw['builder'] = 'DVI'
 
-    if kw['builder'] == 'DVI':
-        # Suffixes are fixed for DVI builder
-        kw['default_alias_suffix'] = 'dvi'
-        kw['default_suffix'] = '.dvi'
-    elif kw['builder'] == 'PDF':
-        kw['default_alias_suffix'] = 'pdf'
-        try: kw['default_suffix'] = kw['PDFSUFFIX']
-        except KeyError:
-            kw['default_suffix'] = env.subst('$PDFSUFFIX')
-            if not kw['default_suffix']:
-                kw['default_suffix'] = '.pdf'
-    elif kw['builder'] == 'DVIPDFM':
-        kw['default_alias_suffix'] = 'pdf'
-        try: kw['default_suffix'] = kw['DVIPDFMSUFFIX']
+    dirs = {}
+    defaults = {}
+    aliases = {}
+    always = set()
+    order = []
+    targets = []
+    for spec in specs:
+        name, source, rkw = _docs_row(spec, **kw)
+
+        key = (rkw['builder'], rkw.get('PDFSUFFIX'), rkw.get('DVIPDFMSUFFIX'))
+        try: rkw.update(defaults[key])
         except KeyError:
-            kw['default_suffix'] = env.subst('$DVIPDFMSUFFIX')
-            if not kw['default_suffix']:
-                kw['default_suffix'] = '.pdf'
-    else:
-        raise SCons.Errors.UserError('Unsupported builder: %r' % repr(kw['builder']))
+            defaults[key] = _doc_defaults(env, **rkw)
+            rkw.update(defaults[key])
 
-    return _builddoc(env, name, source, **kw)
+        out_dir = rkw.get('out_dir', '.')
+        if not isinstance(out_dir, SCons.Node.FS.Dir):
+            try: rkw['out_dir'] = dirs[out_dir]
+            except KeyError:
+                rkw['out_dir'] = dirs[out_dir] = env.Dir(out_dir)
+
+        target, alias = _declaredoc(env, name, source, **rkw)
+        if alias:
+            try: aliases[alias].extend(target)
+            except KeyError:
+                aliases[alias] = list(target)
+                order.append(alias)
+            if TeXASCommon.get_always_build(env, **rkw):
+                always.add(alias)
+        targets.extend(target)
+
+    for alias in order:
+        node = env.Alias(alias, aliases[alias])
+        if alias in always:
+            env.AlwaysBuild(node)
+    return targets
 
 def DVI(env, name, source=_null, **kw):
     """Compile ``*.dvi`` document with SCons DVI builder.
@@ -157,6 +242,10 @@ def DVI(env, name, source=_null, **kw):
             create any alias set ``alias=None``,
         alias_suffix
             alias suffix to be used instead of the default ``dvi`` alias suffix,
+        always_build
+            if true (default), the alias is built on every invocation of
+            **scons**, otherwise only when its targets are out of date; the
+            default may be changed with ``$TEXASALWAYSBUILD``,
         deps
             extra dependencies for DVI target,
         out_dir
@@ -193,6 +282,10 @@ def PDF(env, name, source=_null, **kw):
             create any alias set ``alias=None``,
         alias_suffix
             alias suffix to be used instead of the default ``dvi`` alias suffix,
+        always_build
+            if true (default), the alias is built on every invocation of
+            **scons**, otherwise only when its targets are out of date; the
+            default may be changed with ``$TEXASALWAYSBUILD``,
         deps
             extra dependencies for PDF target,
         out_dir
@@ -230,6 +323,10 @@ def DVIPDFM(env, name, source=_null, **kw):
             create any alias set ``alias=None``,
         alias_suffix
             alias suffix to be used instead of the default ``dvi`` alias suffix,
+        always_build
+            if true (default), the alias is built on every invocation of
+            **scons**, otherwise only when its targets are out of date; the
+            default may be changed with ``$TEXASALWAYSBUILD``,
         deps
             extra dependencies for PDF target,
         out_dir
@@ -0,0 +1,1594 @@
+# -*- coding: utf-8 -*-
+"""`TeXASImport`
+
+Utilities for importing files from TeX Directory Structure (TDS).
+"""
+
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+def _import_option(env, key, default, **kw):
+    """Return the value of ``TeXASImport`` option ``key``.
+
+    The option is taken from ``kw[key]`` or, if not given, from the
+    ``TEXASIMPORT<KEY>`` construction variable (``<KEY>`` is ``key`` in upper
+    case with underscores removed). If none of them is set, ``default`` is
+    returned.
+    """
+    try:
+        return kw[key]
+    except KeyError:
+        var = 'TEXASIMPORT%s' % key.upper().replace('_', '')
+        return env.get(var, default)
+
+def _tds_suffix(f):
+    """Return the suffix of file ``f`` to be imported from TDS"""
+    import SCons.Util
+    import SCons.Errors
+    suffix = SCons.Util.silent_intern(SCons.Util.splitext(f)[1])
+    if not suffix:
+        raise SCons.Errors.UserError("Can't import file '%s' " \
+                                     "which has no suffix." % f)
+    return suffix
+
+def _tds_search_path(env, suffix, paths, **kw):
+    """Return TDS search path for files with ``suffix``, as reported by
+    ``env.KPSShowPath()``, but with the '.' (CWD) entries removed.
+
+    The ``paths`` dictionary memoizes search paths already computed.
+    """
+    import re
+    import platform
+    try:
+        return paths[suffix]
+    except KeyError:
+        pass
+    path = env.KPSShowPath(suffix, **kw)
+    # Remove all '.' (CWD) dir entries
+    if platform.system() == 'Windows':
+        path = re.sub(r'(?:^\.[\\/]*;|;\.[\\/]*$)', r'', path)
+        path = re.sub(r';\.[\\/]*;',r';', path)
+    else:
+        path = re.sub(r'(?:^\./*:|:\./*$)', r'', path)
+        path = re.sub(r':\./*:',r':', path)
+    paths[suffix] = path
+    return path
+
+def _tds_find_single(env, source, paths, **kw):
+    """Look up TDS files one by one (one ``kpsewhich`` call per file)"""
+    found = {}
+    for f in source:
+        kw['path'] = _tds_search_path(env, _tds_suffix(f), paths, **kw)
+        # Find the file in TDS
+        found[f] = env.KPSFindFiles(f, **kw)
+    return found
+
+def _tds_match(name, path):
+    """Check whether ``path`` found by ``kpsewhich`` corresponds to ``name``"""
+    import os
+    name = '/'.join(name.split(os.path.sep))
+    path = '/'.join(path.split(os.path.sep))
+    return path == name or path.endswith('/' + name)
+
+def _tds_find_batch(env, source, paths, **kw):
+    """Look up TDS files grouped by suffix (one ``kpsewhich`` call per
+    suffix)"""
+    groups = {}
+    suffixes = []
+    seen = set()
+    for f in source:
+        suffix = _tds_suffix(f)
+        if suffix not in groups:
+            groups[suffix] = []
+            suffixes.append(suffix)
+        if f not in seen:
+            groups[suffix].append(f)
+            seen.add(f)
+
+    found = {}
+    for suffix in suffixes:
+        files = groups[suffix]
+        kw['path'] = _tds_search_path(env, suffix, paths, **kw)
+        result = env.KPSFindFiles(files, **kw)
+        # kpsewhich prints found files in order of its arguments, and just
+        # skips the ones which are not found
+        i = 0
+        for f in files:
+            if i < len(result) and _tds_match(f, result[i]):
+                found[f] = [result[i]]
+                i += 1
+            else:
+                found[f] = []
+    return found
+
+_lsr_indices = {}
+_lsr_dbs = {}
+_walk_indices = {}
+
+def _lsr_split(path):
+    """Split kpathsea search path into elements, expanding braces"""
+    import os
+    elements = []
+    depth = 0
+    start = 0
+    for i, c in enumerate(path):
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+        elif c == os.pathsep and depth == 0:
+            elements.append(path[start:i])
+            start = i + 1
+    elements.append(path[start:])
+    return [e for x in elements for e in _lsr_expand_braces(x) if e]
+
+def _lsr_expand_braces(s):
+    """Expand ``{a,b}`` constructs in search path element ``s``"""
+    i = s.find('{')
+    if i < 0:
+        return [s]
+    depth = 0
+    parts = []
+    start = i + 1
+    for j in range(i, len(s)):
+        c = s[j]
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0:
+                break
+        elif c == ',' and depth == 1:
+            parts.append(s[start:j])
+            start = j + 1
+    else:
+        return [s]
+    parts.append(s[start:j])
+    return [r for p in parts for r in _lsr_expand_braces(s[:i] + p + s[j+1:])]
+
+def _lsr_norm(path):
+    """Normalize directory name for use as a key in file name index"""
+    import os
+    return '/'.join(os.path.abspath(path).split(os.path.sep))
+
+def _lsr_read(lsr):
+    """Parse ``ls-R`` database, return an index basename -> directories"""
+    import os
+    import io
+    root = _lsr_norm(os.path.dirname(lsr))
+    index = {}
+    d = root
+    with io.open(lsr, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.rstrip('\r\n')
+            if not line or line.startswith('%'):
+                continue
+            if line.endswith(':'):
+                d = line[:-1]
+                if d.startswith('./') or d == '.':
+                    d = root + d[1:]
+                elif not d.startswith('/'):
+                    d = root + '/' + d
+                d = d.rstrip('/')
+            else:
+                index.setdefault(line, []).append(d)
+    return index
+
+def _lsr_index(lsr):
+    """Return (memoized) index of the ``ls-R`` database ``lsr``"""
+    sig = _cache_stat(lsr)
+    try:
+        old, index = _lsr_indices[lsr]
+    except KeyError:
+        pass
+    else:
+        if old == sig:
+            return index
+    index = _lsr_read(lsr)
+    _lsr_indices[lsr] = (sig, index)
+    return index
+
+def _kps_setup(env, **kw):
+    """Return keywords relevant to path expansion and a key identifying
+    them (together with ``$KPSVARIABLES``)"""
+    import json
+    kw = dict((k, kw[k]) for k in ('KPSVARIABLES', 'progname') if k in kw)
+    key = json.dumps([env.get('KPSVARIABLES', {}), kw], sort_keys=True,
+                     default=str)
+    return kw, key
+
+def _lsr_databases(env, **kw):
+    """Return ``ls-R`` databases used by kpathsea (from ``$TEXMFDBS``) as
+    a list of (root directory, database file) pairs"""
+    import os
+    kw, key = _kps_setup(env, **kw)
+    try:
+        return _lsr_dbs[key]
+    except KeyError:
+        pass
+    dbs = []
+    for d in env.KPSExpandPath('$TEXMFDBS', **kw).split(os.pathsep):
+        for name in ('ls-R', 'ls-r'):
+            if d and os.path.isfile(os.path.join(d, name)):
+                dbs.append((_lsr_norm(d), os.path.join(d, name)))
+                break
+    _lsr_dbs[key] = dbs
+    return dbs
+
+def _lsr_root(d, dbs):
+    """Find the ``ls-R`` database covering directory ``d``"""
+    for root, lsr in dbs:
+        if d == root or d.startswith(root.rstrip('/') + '/'):
+            return lsr
+    return None
+
+def _walk_index(d, limit):
+    """Index directory tree ``d`` (without ``ls-R``) by walking it. Return
+    ``None`` if the tree has more than ``limit`` entries."""
+    import os
+    try:
+        return _walk_indices[d]
+    except KeyError:
+        pass
+    index = {}
+    count = 0
+    for root, dirs, files in os.walk(d):
+        dirs[:] = sorted(x for x in dirs if not x.startswith('.'))
+        count += len(dirs) + len(files)
+        if count > limit:
+            index = None
+            break
+        root = '/'.join(root.split(os.path.sep))
+        for f in files:
+            index.setdefault(f, []).append(root)
+    _walk_indices[d] = index
+    return index
+
+def _lsr_search(name, elements, dbs, limit):
+    """Search for file ``name`` within search path ``elements``.
+
+    Return the path found, ``''`` if the file is surely not in the search
+    path, or ``None`` if some of the elements can't be searched without
+    ``kpsewhich``.
+    """
+    import os
+    name = '/'.join(name.split(os.path.sep))
+    i = name.rfind('/')
+    subdir, base = name[:max(i, 0)], name[i+1:]
+    for e in elements:
+        dbonly = e.startswith('!!')
+        e = e.lstrip('!')
+        recursive = e.endswith('//')
+        d = _lsr_norm(e.rstrip('/\\') or '/')
+        lsr = _lsr_root(d, dbs)
+        if lsr:
+            index = _lsr_index(lsr)
+        elif dbonly:
+            continue
+        elif not os.path.isdir(d):
+            continue
+        elif recursive:
+            index = _walk_index(d, limit)
+            if index is None:
+                return None
+        else:
+            # Non-recursive element, ``subdir`` is looked up right below ``d``
+            sd = d.rstrip('/') + '/' + subdir if subdir else d
+            if os.path.isfile(os.path.join(sd, base)):
+                index = {base: [sd]}
+            else:
+                index = {}
+        for cand in index.get(base, []):
+            if subdir:
+                if not cand.endswith('/' + subdir):
+                    continue
+                top = cand[:-len(subdir)-1]
+            else:
+                top = cand
+            if top == d or (recursive and top.startswith(d.rstrip('/') + '/')):
+                path = cand + '/' + base
+                if os.path.isfile(path):
+                    return path
+    return ''
+
+def _tds_find_lsr(env, source, paths, **kw):
+    """Look up TDS files with in-process ``ls-R`` reader, use ``kpsewhich``
+    only for files in trees that can't be indexed"""
+    limit = int(_import_option(env, 'walk_limit', 10000, **kw))
+    dbs = _lsr_databases(env, **kw)
+    found = {}
+    fallback = []
+    for f in source:
+        path = _tds_search_path(env, _tds_suffix(f), paths, **kw)
+        result = _lsr_search(f, _lsr_split(path), dbs, limit)
+        if result is None:
+            fallback.append(f)
+        else:
+            found[f] = [result] if result else []
+    if fallback:
+        found.update(_tds_find_batch(env, fallback, paths, **kw))
+    return found
+
+_kpse_servers = {}
+_kpse_sentinel = []
+_kpse_broken = []
+
+def _kpse_sentinel_file():
+    """Return an absolute path of a file which surely exists; it's used to
+    mark the end of answer from ``kpsewhich -interactive``"""
+    import os
+    import tempfile
+    if not _kpse_sentinel:
+        fd, path = tempfile.mkstemp(prefix='texas-kpse-', suffix='.tex')
+        os.close(fd)
+        _kpse_sentinel.append(os.path.abspath(path))
+    return _kpse_sentinel[0]
+
+class _KpseServer(object):
+    """Long-lived ``kpsewhich -interactive`` co-process.
+
+    Every query is followed by a query for the sentinel file (an absolute
+    path, which kpsewhich echoes back), so we know where the answer ends even
+    if the file was not found. Where possible, the output of kpsewhich goes
+    through a pseudo-terminal, so it's line-buffered.
+    """
+
+    timeout = 30
+
+    def __init__(self, cmd, ENV):
+        import os
+        import threading
+        import subprocess
+        try:
+            import queue
+        except ImportError:
+            import Queue as queue
+        self.sentinel = _kpse_sentinel_file()
+        self.marker = os.path.basename(self.sentinel)
+        self.lock = threading.Lock()
+        self.lines = queue.Queue()
+        self.devnull = open(os.devnull, 'w')
+        try:
+            import pty
+            master, slave = pty.openpty()
+        except (ImportError, OSError):
+            master, slave = None, subprocess.PIPE
+        try:
+            self.proc = subprocess.Popen(cmd, env=ENV,
+                                         stdin=subprocess.PIPE,
+                                         stdout=slave,
+                                         stderr=self.devnull)
+        except (IOError, OSError):
+            self.devnull.close()
+            if master is not None:
+                os.close(master)
+                os.close(slave)
+            raise
+        self.pty = master is not None
+        if self.pty:
+            os.close(slave)
+            self.fd = master
+        else:
+            self.fd = self.proc.stdout.fileno()
+        self.reader = threading.Thread(target=self._read)
+        self.reader.daemon = True
+        self.reader.start()
+        # Skip output of the -var-value workaround (if any)
+        self.alive = self._ask() is not None
+
+    def _read(self):
+        import os
+        buf = ''
+        while True:
+            try:
+                data = os.read(self.fd, 4096)
+            except OSError:
+                break
+            if not data:
+                break
+            lines = (buf + data.decode('utf-8', 'replace')).split('\n')
+            buf = lines.pop()
+            for line in lines:
+                self.lines.put(line.rstrip('\r'))
+        self.lines.put(None)
+
+    def _get(self):
+        try:
+            import queue
+        except ImportError:
+            import Queue as queue
+        try:
+            return self.lines.get(timeout=self.timeout)
+        except queue.Empty:
+            return None
+
+    def _ask(self, name=None):
+        import os
+        query = '%s\n' % self.sentinel
+        if name is not None:
+            query = '%s\n%s' % (name, query)
+        self.proc.stdin.write(query.encode('utf-8'))
+        self.proc.stdin.flush()
+        result = []
+        while True:
+            line = self._get()
+            if line is None:
+                self.alive = False
+                return None
+            if os.path.basename(line) == self.marker:
+                return result
+            result.append(line)
+
+    def find(self, name):
+        """Return list of files found or ``None`` if the co-process is not
+        usable"""
+        with self.lock:
+            if not self.alive:
+                return None
+            try:
+                return self._ask(name)
+            except (IOError, OSError, ValueError):
+                self.alive = False
+                return None
+
+    def close(self):
+        import os
+        with self.lock:
+            self.alive = False
+            try:
+                self.proc.stdin.write('q\n'.encode('utf-8'))
+                self.proc.stdin.close()
+            except (IOError, OSError, ValueError):
+                pass
+            for i in range(50):
+                if self.proc.poll() is not None:
+                    break
+                self.reader.join(0.1)
+            else:
+                self.proc.kill()
+                self.proc.wait()
+            if self.pty:
+                try:
+                    os.close(self.fd)
+                except OSError:
+                    pass
+            self.devnull.close()
+
+def _kpse_shutdown():
+    """Stop all ``kpsewhich`` co-processes (called at exit)"""
+    import os
+    for server in list(_kpse_servers.values()):
+        if server:
+            server.close()
+    _kpse_servers.clear()
+    for path in _kpse_sentinel:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    del _kpse_sentinel[:]
+
+def _kpse_server(env, path, **kw):
+    """Return (pooled) ``kpsewhich`` co-process searching within ``path``,
+    or ``None`` if it can't be started"""
+    import atexit
+    import SCons.Util
+    kps = dict(env.get('KPSVARIABLES', dict()))
+    kps.update(kw.get('KPSVARIABLES', dict()))
+    ENV = dict((k, str(v)) for k, v in env.get('ENV', dict()).items())
+    ENV.update((k, str(v)) for k, v in kps.items())
+    # Same workaround as in kpsewhich tool - first file is not found when
+    # -path is used
+    ENV['_KPS_VV_WKND_'] = '$_KPS_VV_WKND_VALUE'
+
+    exe = env.WhereIs('$KPSEWHICH') or env.subst('$KPSEWHICH')
+    cmd = SCons.Util.CLVar(exe) \
+        + SCons.Util.CLVar(env.subst('$KPSEWHICHFLAGS')) \
+        + ['-var-value', '_KPS_VV_WKND_']
+    for opt in ('dpi', 'format', 'progname', 'subdir'):
+        if opt in kw:
+            cmd += ['-%s' % opt, env.subst(kw[opt])]
+    cmd += ['-path', path, '-interactive']
+
+    if _kpse_broken:
+        return None
+    key = (tuple(cmd), tuple(sorted(ENV.items())))
+    try:
+        return _kpse_servers[key]
+    except KeyError:
+        pass
+    if not _kpse_servers:
+        atexit.register(_kpse_shutdown)
+    try:
+        server = _KpseServer(list(cmd), ENV)
+    except (IOError, OSError):
+        server = None
+    if server and not server.alive:
+        # Don't wait for another non-responding co-process, fall back to
+        # batched lookups from now on
+        _kpse_broken.append(key)
+        server.close()
+        server = None
+    _kpse_servers[key] = server
+    return server
+
+def _tds_find_interactive(env, source, paths, **kw):
+    """Look up TDS files with pooled ``kpsewhich -interactive``
+    co-processes, one per search path"""
+    found = {}
+    fallback = []
+    for f in source:
+        path = _tds_search_path(env, _tds_suffix(f), paths, **kw)
+        server = _kpse_server(env, path, **kw)
+        result = server.find(f) if server else None
+        if result is None:
+            fallback.append(f)
+        else:
+            found[f] = result
+    if fallback:
+        found.update(_tds_find_batch(env, fallback, paths, **kw))
+    return found
+
+_tds_lookups = {
+    'single': _tds_find_single,
+    'batch': _tds_find_batch,
+    'lsr': _tds_find_lsr,
+    'interactive': _tds_find_interactive,
+}
+
+_cache_version = 1
+_caches = {}
+
+def _cache_stat(path):
+    """Return a (mtime, size) signature of a file watched by the cache"""
+    import os
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime, st.st_size]
+
+def _cache_is_kpsvar(name):
+    """Check whether environment variable ``name`` may affect kpathsea"""
+    import re
+    return re.match(r'^(?:TEXMF|TEXFONTS|KPSE|SELFAUTO)|(?:INPUTS|FONTS)$',
+                    name) is not None
+
+class _LookupCache(object):
+    """Persistent cache of TDS lookups.
+
+    The cache is a JSON file which holds separate entries (contexts) for
+    distinct kpathsea setups. A context is identified by the ``kpsewhich``
+    executable, its options and the relevant environment variables
+    (``TEXMF*``, ``*INPUTS``, etc.). Each context records search paths (per
+    suffix) and files resolved within these paths (``[]`` for files not
+    found). A context is dropped when any of the ``ls-R`` databases,
+    ``texmf.cnf`` files or the ``kpsewhich`` executable it depends on has
+    changed.
+    """
+
+    def __init__(self, path):
+        import json
+        self.path = path
+        self.dirty = False
+        self.checked = set()
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            data = None
+        if not isinstance(data, dict) or data.get('version') != _cache_version:
+            data = {'version': _cache_version, 'contexts': {}}
+        self.data = data
+
+    def _key(self, env, **kw):
+        import os
+        import json
+        import hashlib
+        kps = dict(env.get('KPSVARIABLES', dict()))
+        kps.update(kw.get('KPSVARIABLES', dict()))
+        ENV = dict(env.get('ENV', dict()))
+        ENV.update(kps)
+        state = {
+            'cwd': os.getcwd(),
+            'kpsewhich': env.WhereIs('$KPSEWHICH') or env.subst('$KPSEWHICH'),
+            'flags': env.subst('$KPSEWHICHFLAGS'),
+            'options': dict((k, env.subst(str(kw[k])))
+                            for k in ('dpi', 'format', 'progname', 'subdir')
+                            if k in kw),
+            'variables': dict((k, str(v)) for k, v in ENV.items()
+                              if _cache_is_kpsvar(k)),
+        }
+        state = json.dumps(state, sort_keys=True).encode('utf-8')
+        return hashlib.md5(state).hexdigest()
+
+    def _watched(self, env, **kw):
+        """Return files the kpathsea setup depends on."""
+        kw = dict((k, kw[k]) for k in ('KPSVARIABLES', 'progname') if k in kw)
+        files = []
+        exe = env.WhereIs('$KPSEWHICH')
+        if exe:
+            files.append(exe)
+        files.extend(lsr for root, lsr in _lsr_databases(env, **kw))
+        files.extend(env.KPSFindAllFiles('texmf.cnf', **kw))
+        return dict((f, _cache_stat(f)) for f in files)
+
+    def context(self, env, **kw):
+        """Return (valid) cache entry for the kpathsea setup in use."""
+        key = self._key(env, **kw)
+        contexts = self.data['contexts']
+        ctx = contexts.get(key)
+        if ctx is not None and key not in self.checked:
+            for f, sig in ctx['watched'].items():
+                if _cache_stat(f) != sig:
+                    ctx = None
+                    break
+        if ctx is None:
+            ctx = {'watched': self._watched(env, **kw),
+                   'paths': {},
+                   'files': {}}
+            contexts[key] = ctx
+            self.dirty = True
+        self.checked.add(key)
+        return ctx
+
+    def find(self, env, source, find, **kw):
+        """Look up ``source`` files, ask ``find`` only for the ones missing
+        in the cache."""
+        import os
+        ctx = self.context(env, **kw)
+        paths = ctx['paths']
+        files = ctx['files']
+        npaths = len(paths)
+        found = {}
+        missing = []
+        for f in source:
+            suffix = _tds_suffix(f)
+            try:
+                found[f] = files[paths[suffix]][f]
+            except KeyError:
+                missing.append(f)
+            else:
+                if not all(os.path.isfile(p) for p in found[f]):
+                    # The file has been removed from TDS in the meantime
+                    del files[paths[suffix]][f]
+                    del found[f]
+                    missing.append(f)
+                    self.dirty = True
+        if missing:
+            for f, result in find(env, missing, paths, **kw).items():
+                found[f] = result
+                # Misses are recorded as [], so that they're not looked up
+                # again until the kpathsea setup changes
+                path = paths[_tds_suffix(f)]
+                files.setdefault(path, {})[f] = result
+                self.dirty = True
+        if len(paths) != npaths:
+            self.dirty = True
+        return found
+
+    def scan(self, env, path, **kw):
+        """Return dependencies of TDS file ``path`` (see ``_scan_file()``),
+        scan results are kept in the cache."""
+        scans = self.context(env, **kw).setdefault('scans', {})
+        entry = scans.get(path)
+        deps = _scan_file(path, scans)
+        if scans.get(path) is not entry:
+            self.dirty = True
+        return deps
+
+    def save(self):
+        """Write the cache back to disk (if modified)."""
+        import os
+        import json
+        import SCons.Warnings
+        if not self.dirty or _no_writes():
+            return
+        tmp = self.path + '.tmp'
+        try:
+            d = os.path.dirname(self.path)
+            if d and not os.path.isdir(d):
+                os.makedirs(d)
+            with open(tmp, 'w') as f:
+                json.dump(self.data, f, sort_keys=True)
+            if os.path.exists(self.path) and not hasattr(os, 'replace'):
+                os.remove(self.path)
+            getattr(os, 'replace', os.rename)(tmp, self.path)
+        except (IOError, OSError) as e:
+            SCons.Warnings.warn(SCons.Warnings.WarningOnByDefault,
+                                "can't write TeXASImport cache %r: %s"
+                                % (self.path, e))
+        else:
+            self.dirty = False
+
+def _no_writes():
+    """Check whether files shall not be written (dry runs and cleanups)"""
+    import SCons.Script
+    return SCons.Script.GetOption('no_exec') or SCons.Script.GetOption('clean')
+
+def _import_cache(env, **kw):
+    """Return the lookup cache to be used, or ``None`` if caching is
+    disabled."""
+    import SCons.Util
+    cache = _import_option(env, 'cache', None, **kw)
+    if not cache:
+        return None
+    if not SCons.Util.is_String(cache) and not hasattr(cache, 'abspath'):
+        cache = (env.subst('$CONFIGUREDIR') or '#/.sconf_temp') \
+              + '/texas-import.cache'
+    path = env.File(cache).abspath
+    try:
+        return _caches[path]
+    except KeyError:
+        _caches[path] = _LookupCache(path)
+        return _caches[path]
+
+_lock_version = 1
+_lockfiles = {}
+_refresh_option = []
+
+def _lock_refresh():
+    """Check whether the ``--texas-refresh-imports`` option was given"""
+    import SCons.Script
+    if not _refresh_option:
+        SCons.Script.AddOption('--texas-refresh-imports',
+                               dest='texas_refresh_imports',
+                               action='store_true', default=False,
+                               help='re-resolve files recorded in '
+                                    'TeXASImport lockfiles')
+        _refresh_option.append(True)
+    return SCons.Script.GetOption('texas_refresh_imports')
+
+def _lock_digest(path):
+    """Return SHA-256 hex digest of file ``path``"""
+    import hashlib
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _lock_warn(msg):
+    import SCons.Warnings
+    SCons.Warnings.warn(SCons.Warnings.WarningOnByDefault, msg)
+
+class _LockFile(object):
+    """Lockfile of TDS imports.
+
+    The lockfile is a JSON file which records, for every imported file name,
+    the path it was resolved to and the size and SHA-256 hash of the file (or
+    ``null`` for names which were not found in TDS). Names recorded in the
+    lockfile are not looked up again, until the ``--texas-refresh-imports``
+    command-line option is used. Files which have changed since they were
+    recorded are reported with warnings.
+    """
+
+    def __init__(self, path, refresh=False):
+        import json
+        import threading
+        self.path = path
+        self.dirty = False
+        self.verified = set()
+        self.lock = threading.RLock()
+        data = None
+        if not refresh:
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except (IOError, OSError, ValueError):
+                pass
+        if not isinstance(data, dict) or data.get('version') != _lock_version:
+            data = {'version': _lock_version, 'files': {}}
+            self.dirty = True
+        self.files = data['files']
+
+    def _record(self, name, paths):
+        if paths:
+            entry = {'path': paths[0],
+                     'size': _cache_stat(paths[0])[1],
+                     'sha256': _lock_digest(paths[0])}
+        else:
+            entry = None
+        self.files[name] = entry
+        self.verified.add(name)
+        self.dirty = True
+
+    def find(self, source, lookup):
+        """Return paths of ``source`` files recorded in the lockfile, the
+        files not recorded yet are looked up with ``lookup`` and recorded."""
+        with self.lock:
+            found = {}
+            missing = []
+            for f in source:
+                try:
+                    entry = self.files[f]
+                except KeyError:
+                    missing.append(f)
+                    continue
+                if entry is None:
+                    found[f] = []
+                    continue
+                sig = _cache_stat(entry['path'])
+                if sig is None:
+                    _lock_warn("'%s' recorded in %r doesn't exist anymore, "
+                               "use --texas-refresh-imports to update the "
+                               "lockfile" % (entry['path'], self.path))
+                    missing.append(f)
+                    continue
+                if sig[1] != entry['size']:
+                    _lock_warn("'%s' has changed since it was recorded in "
+                               "%r, use --texas-refresh-imports to update "
+                               "the lockfile" % (entry['path'], self.path))
+                    self.verified.add(f)
+                found[f] = [entry['path']]
+            if missing:
+                for f, paths in lookup(missing).items():
+                    found[f] = paths
+                    if f not in self.files:
+                        self._record(f, paths)
+            return found
+
+    def verify(self, name, path):
+        """Check content of the imported file ``path`` against its hash
+        recorded in the lockfile."""
+        import os
+        with self.lock:
+            entry = self.files.get(name)
+            if not entry or name in self.verified:
+                return
+            if os.path.abspath(entry['path']) != os.path.abspath(path):
+                return
+            self.verified.add(name)
+        if _lock_digest(path) != entry['sha256']:
+            _lock_warn("'%s' has changed since it was recorded in %r, use "
+                       "--texas-refresh-imports to update the lockfile"
+                       % (path, self.path))
+
+    def save(self):
+        """Write the lockfile back to disk (if modified)."""
+        import os
+        import json
+        with self.lock:
+            if not self.dirty or _no_writes():
+                return
+            data = {'version': _lock_version, 'files': self.files}
+            tmp = self.path + '.tmp'
+            try:
+                with open(tmp, 'w') as f:
+                    json.dump(data, f, sort_keys=True, indent=2,
+                              separators=(',', ': '))
+                    f.write('\n')
+                if os.path.exists(self.path) and not hasattr(os, 'replace'):
+                    os.remove(self.path)
+                getattr(os, 'replace', os.rename)(tmp, self.path)
+            except (IOError, OSError) as e:
+                _lock_warn("can't write TeXASImport lockfile %r: %s"
+                           % (self.path, e))
+            else:
+                self.dirty = False
+
+def _import_lockfile(env, **kw):
+    """Return the lockfile to be used, or ``None`` if disabled."""
+    import SCons.Util
+    lockfile = _import_option(env, 'lockfile', None, **kw)
+    if not lockfile:
+        return None
+    if not SCons.Util.is_String(lockfile) and not hasattr(lockfile, 'abspath'):
+        lockfile = '#texas-import.lock'
+    path = env.File(lockfile).abspath
+    try:
+        return _lockfiles[path]
+    except KeyError:
+        _lockfiles[path] = _LockFile(path, _lock_refresh())
+        return _lockfiles[path]
+
+def _lock_verify(node, path):
+    """Verify file imported to ``node`` from ``path`` against the lockfile"""
+    try:
+        lock, name = node.attributes.texas_lock
+    except AttributeError:
+        return
+    lock.verify(name, path)
+
+def _pool_map(func, items, jobs):
+    """Map ``func`` over ``items`` using a pool of ``jobs`` threads"""
+    if jobs < 2 or len(items) < 2:
+        return [func(x) for x in items]
+    from multiprocessing.pool import ThreadPool
+    pool = ThreadPool(min(jobs, len(items)))
+    try:
+        return pool.map(func, items)
+    finally:
+        pool.close()
+        pool.join()
+
+def _tds_chunks(env, source, paths, single, **kw):
+    """Split ``source`` into chunks which may be looked up in parallel.
+
+    Files are grouped by search path, so that a single chunk is handled by a
+    single ``kpsewhich`` invocation (or co-process). Search paths are
+    determined here, before any worker thread starts. If ``single`` is
+    ``True``, every file makes a separate chunk.
+    """
+    chunks = {}
+    order = []
+    for f in source:
+        path = _tds_search_path(env, _tds_suffix(f), paths, **kw)
+        if single:
+            order.append([f])
+            continue
+        if path not in chunks:
+            chunks[path] = []
+            order.append(chunks[path])
+        chunks[path].append(f)
+    return order
+
+def _tds_parallel(find, lookup, jobs):
+    """Wrap lookup function ``find``, such that the lookups run in a pool of
+    ``jobs`` threads"""
+    def parallel_find(env, source, paths, **kw):
+        chunks = _tds_chunks(env, source, paths, lookup == 'single', **kw)
+        found = {}
+        for result in _pool_map(lambda c: find(env, c, paths, **kw),
+                                chunks, jobs):
+            found.update(result)
+        return found
+    return parallel_find
+
+def _tds_lookup(env, source, **kw):
+    """Look up ``source`` files in TDS, as requested by keywords ``kw``.
+
+    :Returns:
+        dictionary which maps file names onto lists of paths found.
+    """
+    import SCons.Errors
+    lookup = _import_option(env, 'lookup', 'single', **kw)
+    try:
+        find = _tds_lookups[lookup]
+    except KeyError:
+        raise SCons.Errors.UserError("Unsupported lookup: %r" % lookup)
+
+    jobs = int(_import_option(env, 'jobs', 1, **kw))
+    if jobs > 1:
+        find = _tds_parallel(find, lookup, jobs)
+
+    cache = _import_cache(env, **kw)
+    if cache:
+        found = cache.find(env, source, find, **kw)
+        cache.save()
+    else:
+        found = find(env, source, {}, **kw)
+    return found
+
+def _tds_resolve(env, source, **kw):
+    """Look up ``source`` files in TDS, as requested by keywords ``kw``, or
+    take them from the lockfile (if enabled).
+
+    :Returns:
+        dictionary which maps file names onto lists of paths found.
+    """
+    lock = _import_lockfile(env, **kw)
+    if lock:
+        found = lock.find(source, lambda s: _tds_lookup(env, s, **kw))
+        lock.save()
+    else:
+        found = _tds_lookup(env, source, **kw)
+    return found
+
+_scan_suffixes = ('.cls', '.sty', '.clo', '.cfg', '.def', '.fd', '.tex',
+                  '.ltx')
+_scan_regexps = []
+_scan_cache = {}
+
+def _scan_patterns():
+    """Return (regex, default suffix) pairs used to find dependencies"""
+    import re
+    if not _scan_regexps:
+        opts = r'\s*(?:\[[^\]]*\]\s*)?'
+        arg = r'\{([^{}]*)\}'
+        _scan_regexps.extend([
+            (re.compile(r'\\(?:RequirePackage|RequirePackageWithOptions|'
+                        r'usepackage)' + opts + arg), '.sty'),
+            (re.compile(r'\\(?:LoadClass|LoadClassWithOptions|'
+                        r'documentclass)' + opts + arg), '.cls'),
+            (re.compile(r'\\(?:input|include|InputIfFileExists|'
+                        r'IfFileExists)\s*' + arg), '.tex'),
+            (re.compile(r'\\input\s+([^\s{}\\%]+)'), '.tex'),
+            (re.compile(r'\\bibliographystyle\s*' + arg), '.bst'),
+        ])
+    return _scan_regexps
+
+def _scan_text(text):
+    """Return names of files required by the TeX source ``text``"""
+    import re
+    import SCons.Util
+    text = re.sub(r'(?<!\\)%.*', '', text)
+    deps = []
+    for regex, suffix in _scan_patterns():
+        for m in regex.finditer(text):
+            for name in m.group(1).split(','):
+                name = name.strip()
+                # Names computed by macros can't be resolved
+                if not name or '\\' in name or '#' in name:
+                    continue
+                if not SCons.Util.splitext(name)[1]:
+                    name += suffix
+                if name not in deps:
+                    deps.append(name)
+    return deps
+
+def _scan_file(path, scans):
+    """Return names of files required by TDS file ``path``.
+
+    The ``scans`` dictionary holds results of previous scans, an entry is
+    reused if the file's modification time and size are unchanged.
+    """
+    sig = _cache_stat(path)
+    if sig is None:
+        return []
+    try:
+        entry = scans[path]
+    except KeyError:
+        pass
+    else:
+        if entry[0] == sig:
+            return entry[1]
+    with open(path, 'rb') as f:
+        text = f.read().decode('latin-1')
+    deps = _scan_text(text)
+    scans[path] = [sig, deps]
+    return deps
+
+def _tds_resolve_closure(env, source, **kw):
+    """Look up ``source`` files in TDS together with the files they require
+    (``\\RequirePackage``, ``\\LoadClass``, ``\\input``, etc.)
+
+    Files are resolved level by level. Files required by imported ones,
+    which are not found in TDS, are skipped.
+    """
+    import SCons.Util
+    kw['jobs'] = int(_import_option(env, 'jobs', 4, **kw))
+    cache = _import_cache(env, **kw)
+    if cache:
+        scan = lambda path: cache.scan(env, path, **kw)
+    else:
+        scan = lambda path: _scan_file(path, _scan_cache)
+
+    found = {}
+    seen = set(source)
+    pending = source
+    while pending:
+        result = _tds_resolve(env, pending, **kw)
+        scanned = []
+        for f in pending:
+            paths = result.get(f) or []
+            if paths or f in source:
+                found[f] = paths
+            if paths and SCons.Util.splitext(f)[1] in _scan_suffixes:
+                scanned.append(paths[0])
+        pending = []
+        for deps in _pool_map(scan, scanned, kw['jobs']):
+            for d in deps:
+                if d not in seen:
+                    seen.add(d)
+                    pending.append(d)
+    if cache:
+        cache.save()
+    return found
+
+class _LazyImport(object):
+    """Files imported by a single ``env.TeXASImport(..., lazy=True)`` call.
+
+    The files are looked up all together, when the first of them is needed.
+    """
+
+    def __init__(self, env, source, **kw):
+        import threading
+        self.env = env
+        self.source = source
+        self.kw = kw
+        self.found = None
+        self.lock = threading.Lock()
+
+    def resolve(self):
+        with self.lock:
+            if self.found is None:
+                self.found = _tds_resolve(self.env, self.source, **self.kw)
+            return self.found
+
+    def paths(self, name):
+        return self.resolve().get(name) or []
+
+_lazy_builders = {}
+
+def _lazy_source(target):
+    """Return TDS path the lazily imported ``target`` is copied from"""
+    import SCons.Errors
+    name, group = target.attributes.texas_import
+    paths = group.paths(name) if group else []
+    if not paths:
+        raise SCons.Errors.UserError("Can't find '%s' in TDS." % name)
+    return paths[0]
+
+def _lazy_scan(node, env, path):
+    """Target scanner, returns TDS file the ``node`` is imported from"""
+    import SCons.Script
+    if SCons.Script.GetOption('clean'):
+        return []
+    name, group = node.attributes.texas_import
+    return [env.File(p) for p in group.paths(name)]
+
+_import_modes = {
+    'copy': 'Copy',
+    'hardlink': 'Hardlink',
+    'symlink': 'Symlink',
+    'reflink': 'Reflink',
+}
+
+_import_actions = {}
+
+def _reflink(src, dst):
+    """Create a copy-on-write clone ``dst`` of file ``src``.
+
+    Raises ``OSError`` (or ``IOError``) if it's not supported by the platform
+    or filesystem.
+    """
+    import os
+    import sys
+    import errno
+    import shutil
+    if sys.platform.startswith('linux'):
+        import fcntl
+        FICLONE = 0x40049409
+        with open(src, 'rb') as s:
+            with open(dst, 'wb') as d:
+                fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+    elif sys.platform == 'darwin':
+        import subprocess
+        with open(os.devnull, 'w') as null:
+            if subprocess.call(['cp', '-c', src, dst], stderr=null) != 0:
+                raise OSError(errno.ENOTSUP, "can't clone '%s'" % src)
+    else:
+        raise OSError(errno.ENOTSUP, "reflinks are not supported")
+    shutil.copystat(src, dst)
+
+def _import_file(src, dst, mode):
+    """Import TDS file ``src`` as ``dst`` using ``mode`` (see
+    ``_import_modes``). Fall back to copying, if the requested mode is not
+    supported by the platform or filesystem.
+    """
+    import os
+    import shutil
+    if os.path.lexists(dst):
+        os.remove(dst)
+    try:
+        if mode == 'hardlink':
+            return os.link(src, dst)
+        elif mode == 'symlink':
+            return os.symlink(os.path.abspath(src), dst)
+        elif mode == 'reflink':
+            return _reflink(src, dst)
+    except (AttributeError, NotImplementedError, IOError, OSError):
+        if os.path.lexists(dst):
+            os.remove(dst)
+    shutil.copy2(src, dst)
+
+def _import_pairs(target, source):
+    """Return (target, source) pairs of file names to be imported"""
+    pairs = []
+    for t in target:
+        if hasattr(t.attributes, 'texas_import'):
+            pairs.append((str(t), _lazy_source(t)))
+        else:
+            pairs.append((str(t), str(source[0])))
+    return pairs
+
+def _import_mode(env):
+    return env.subst('$TEXASIMPORTMODE') or 'copy'
+
+def _import_files(target, source, env):
+    mode = _import_mode(env)
+    for node, (t, s) in zip(target, _import_pairs(target, source)):
+        _import_file(s, t, mode)
+        _lock_verify(node, s)
+    return 0
+
+def _import_files_str(target, source, env):
+    name = _import_modes.get(_import_mode(env), 'Copy')
+    return '\n'.join('%s("%s", "%s")' % (name, t, s)
+                     for t, s in _import_pairs(target, source))
+
+def _bulk_stored(node):
+    """Return signatures of dependencies recorded by the previous build of
+    ``node``, as a dictionary which maps absolute paths onto csigs."""
+    import os
+    binfo = getattr(node.get_stored_info(), 'binfo', None)
+    stored = {}
+    for nattr, sattr in (('bsources', 'bsourcesigs'),
+                         ('bimplicit', 'bimplicitsigs')):
+        deps = getattr(binfo, nattr, None) or []
+        sigs = getattr(binfo, sattr, None) or []
+        for dep, sig in zip(deps, sigs):
+            stored[os.path.abspath(str(dep))] = getattr(sig, 'csig', None)
+    return stored
+
+def _bulk_current(node, src, mode, deps):
+    """Check whether ``node`` is an up to date import of ``src`` file.
+
+    The ``deps`` maps absolute paths of (current) dependencies onto their
+    nodes.
+    """
+    import os
+    dst = node.get_abspath()
+    src = os.path.abspath(src)
+    if not os.path.lexists(dst):
+        return False
+    if mode == 'symlink':
+        return os.path.islink(dst) and os.readlink(dst) == src
+    if os.path.islink(dst):
+        return False
+    if mode == 'hardlink':
+        return os.path.samefile(dst, src)
+    if os.path.samefile(dst, src) or src not in deps:
+        return False
+    if os.path.getsize(dst) != os.path.getsize(src):
+        return False
+    return _bulk_stored(node).get(src) == deps[src].get_csig()
+
+def _bulk_pending(target, source, env):
+    """Return (node, target, source) triples for files of a bulk import,
+    which need to be updated"""
+    mode = _import_mode(env)
+    deps = list(source) + list(target[0].implicit or [])
+    deps = dict((n.get_abspath(), n) for n in deps)
+    pending = []
+    for node, (t, s) in zip(target, _import_pairs(target, source)):
+        if not _bulk_current(node, s, mode, deps):
+            pending.append((node, t, s))
+    return pending
+
+def _import_bulk(target, source, env):
+    import sys
+    import SCons.Action
+    mode = _import_mode(env)
+    name = _import_modes.get(mode, 'Copy')
+    for node, t, s in _bulk_pending(target, source, env):
+        if SCons.Action.print_actions:
+            sys.stdout.write('%s("%s", "%s")\n' % (name, t, s))
+        _import_file(s, t, mode)
+        _lock_verify(node, s)
+    return 0
+
+def _bulk_dir(target):
+    """Return the common directory of ``target`` nodes"""
+    import os
+    common = None
+    for t in target:
+        parts = str(t.dir).split(os.path.sep)
+        if common is None:
+            common = parts
+        else:
+            n = 0
+            while n < min(len(common), len(parts)) and common[n] == parts[n]:
+                n += 1
+            common = common[:n]
+    return os.path.sep.join(common or [os.curdir])
+
+def _import_bulk_str(target, source, env):
+    name = _import_modes.get(_import_mode(env), 'Copy')
+    pending = _bulk_pending(target, source, env)
+    return '%s(%d of %d files to "%s")' % (name, len(pending), len(target),
+                                          _bulk_dir(target))
+
+def _tds_import_action(bulk=False):
+    """Return the action which imports files from TDS"""
+    import SCons.Action
+    if bulk not in _import_actions:
+        if bulk:
+            funcs = _import_bulk, _import_bulk_str
+        else:
+            funcs = _import_files, _import_files_str
+        _import_actions[bulk] = SCons.Action.Action(*funcs,
+                                                    varlist=['TEXASIMPORTMODE'])
+    return _import_actions[bulk]
+
+def _tds_lazy_builder(bulk=False):
+    """Return the builder used to import files with ``lazy=True``"""
+    import SCons.Builder
+    import SCons.Scanner
+    if bulk not in _lazy_builders:
+        action = _tds_import_action(bulk)
+        scanner = SCons.Scanner.Scanner(_lazy_scan, name='TeXASImport')
+        builder = SCons.Builder.Builder(action=action, target_scanner=scanner)
+        _lazy_builders[bulk] = builder
+    return _lazy_builders[bulk]
+
+_package_areas = ('tex', 'doc', 'bibtex')
+_package_roots = {}
+
+def _texmf_roots(env, **kw):
+    """Return roots of TEXMF trees (from ``$TEXMF``) in order of
+    precedence"""
+    import os
+    kw, key = _kps_setup(env, **kw)
+    try:
+        return _package_roots[key]
+    except KeyError:
+        pass
+    roots = []
+    for d in env.KPSExpandPath('$TEXMF', **kw).split(os.pathsep):
+        d = d.lstrip('!')
+        if d and d not in roots and os.path.isdir(d):
+            roots.append(d)
+    _package_roots[key] = roots
+    return roots
+
+def _package_dirs(env, name, **kw):
+    """Locate directories of TDS package ``name`` (e.g. ``'pgf'`` or
+    ``'latex/pgf'``), such as ``tex/latex/pgf`` or ``doc/generic/pgf``.
+
+    :Returns:
+        list of (directory, TDS-relative path) pairs; when a TDS-relative path
+        exists in several trees, the one from the tree of highest precedence
+        is taken.
+    """
+    import os
+    if '/' in name:
+        kind, name = name.split('/', 1)
+    else:
+        kind = None
+    dirs = []
+    seen = set()
+    for root in _texmf_roots(env, **kw):
+        for area in _package_areas:
+            top = os.path.join(root, area)
+            if kind is not None:
+                kinds = [kind]
+            else:
+                try:
+                    kinds = sorted(os.listdir(top))
+                except OSError:
+                    continue
+            for k in kinds:
+                rel = '/'.join((area, k, name))
+                d = os.path.join(top, k, name)
+                if rel not in seen and os.path.isdir(d):
+                    seen.add(rel)
+                    dirs.append((d, rel))
+    return dirs
+
+def _package_files(env, name, **kw):
+    """Return (TDS-relative path, file) pairs for all files of TDS package
+    ``name``, found by walking its directories"""
+    import os
+    import SCons.Errors
+    dirs = _package_dirs(env, name, **kw)
+    if not dirs:
+        raise SCons.Errors.UserError("Can't find package '%s' in TDS." % name)
+    files = []
+    for d, rel in dirs:
+        for dirpath, dirnames, filenames in os.walk(d):
+            dirnames.sort()
+            sub = os.path.relpath(dirpath, d)
+            if sub != os.curdir:
+                sub = rel + '/' + '/'.join(sub.split(os.path.sep))
+            else:
+                sub = rel
+            for f in sorted(filenames):
+                files.append((sub + '/' + f, os.path.join(dirpath, f)))
+    return files
+
+def _import_packages(env, source, **kw):
+    """Mirror directories of TDS packages ``source`` into ``kw['out_dir']``.
+
+    All the files are imported by a single bulk action (see
+    ``_import_bulk()``).
+    """
+    out_dir = kw['out_dir']
+    mode = kw['import_mode']
+    found = {}
+    order = []
+    for name in source:
+        for rel, path in _package_files(env, name, **kw):
+            if rel not in found:
+                found[rel] = [path]
+                order.append(rel)
+    if not order:
+        return []
+    group = _LazyImport(env, order, **kw)
+    group.found = found
+    nodes = []
+    for rel in order:
+        dst = env.File(rel, out_dir)
+        dst.attributes.texas_import = (rel, group)
+        nodes.append(dst)
+    target = env.Command(nodes, [found[rel][0] for rel in order],
+                         _tds_import_action(True), TEXASIMPORTMODE=mode)
+    env.Precious(target)
+    return target
+
+def ImportFromTDS(env, source, **kw):
+    """Import a file from TeX Directory Structure
+
+    Use ``kpsewhich`` to search for source files within TeX Directory Structure
+    (TDS) and copy them to the target directory ``out_dir``.
+
+    Note: in addition to arguments documented here, this method accepts all
+    keyword parameters recognized by ``env.KPSShowPath()`` and
+    ``env.KPSFindFiles()``. See documentation of ``kpsewhich tool``.
+
+    :Parameters:
+
+        source
+            (a list of) file(s) to be imported
+
+    :Keywords:
+        out_dir
+            where to import files to, defaults to '.'
+        lookup
+            how the files are looked up in TDS; ``'single'`` (default) runs
+            ``kpsewhich`` once for every file, ``'batch'`` groups files by
+            suffix and runs ``kpsewhich`` once per group, ``'lsr'`` reads
+            ``ls-R`` databases and searches them in-process (``kpsewhich`` is
+            only used to determine search paths), ``'interactive'`` sends
+            queries to long-lived ``kpsewhich -interactive`` processes (one
+            per search path, terminated at exit); the default may be changed
+            with the ``$TEXASIMPORTLOOKUP`` construction variable
+        walk_limit
+            used with ``lookup='lsr'``; trees without ``ls-R`` are indexed by
+            walking them, unless they have more than ``walk_limit`` entries
+            (default 10000), in which case ``kpsewhich`` is used instead
+        cache
+            file name of the persistent lookup cache, or ``True`` to use the
+            default ``$CONFIGUREDIR/texas-import.cache``; the cache is
+            disabled by default, the default may be changed with the
+            ``$TEXASIMPORTCACHE`` construction variable
+        lazy
+            if ``True``, the files are looked up in TDS at build time, when
+            any of the imported files is needed for the first time, instead
+            of when the ``SConscript`` is read; the default may be changed
+            with the ``$TEXASIMPORTLAZY`` construction variable
+        import_mode
+            how the files are put into ``out_dir``; ``'copy'`` (default),
+            ``'hardlink'``, ``'symlink'`` or ``'reflink'`` (copy-on-write
+            clone); if the filesystem doesn't support the requested mode,
+            the file is copied; the default may be changed with the
+            ``$TEXASIMPORTMODE`` construction variable
+        recursive
+            if ``True``, the imported files (classes, packages, etc.) are
+            scanned for ``\\RequirePackage``, ``\\LoadClass``,
+            ``\\usepackage``, ``\\input`` and similar commands, and the
+            files they require are imported as well (if found in TDS); scan
+            results are cached (also in the persistent ``cache``); implies
+            ``lazy=False``; the default may be changed with the
+            ``$TEXASIMPORTRECURSIVE`` construction variable
+        jobs
+            number of threads looking up (and scanning) files in parallel,
+            defaults to 4 with ``recursive=True`` and to 1 otherwise; the
+            default may be changed with the ``$TEXASIMPORTJOBS`` construction
+            variable
+        lockfile
+            file name of the lockfile, or ``True`` to use the default
+            ``#texas-import.lock``; the lockfile records paths, sizes and
+            SHA-256 hashes of imported files, the recorded files are not
+            looked up again (until ``scons --texas-refresh-imports`` is run),
+            and warnings are issued if they change; disabled by default, the
+            default may be changed with the ``$TEXASIMPORTLOCKFILE``
+            construction variable
+        bulk
+            if ``True``, all the files are imported by a single
+            (multi-target) action, which only updates the files whose sources
+            have changed; the default may be changed with the
+            ``$TEXASIMPORTBULK`` construction variable
+        package
+            if ``True``, ``source`` are names of TDS packages (e.g.
+            ``'pgf'``, or ``'latex/pgf'`` to restrict the lookup to one
+            format); their directories (``tex/*/<pkg>``, ``doc/*/<pkg>`` and
+            ``bibtex/*/<pkg>`` in TEXMF trees) are located and mirrored into
+            ``out_dir``, keeping their TDS-relative paths; all the files are
+            imported with a single action as with ``bulk=True``; implies
+            ``lazy=False``, ``recursive=False``; the default may be changed
+            with the ``$TEXASIMPORTPACKAGE`` construction variable
+
+    :Returns:
+        list of nodes created in the target directory.
+    """
+    import SCons.Util
+    import SCons.Errors
+
+    if not SCons.Util.is_Sequence(source): source = [source]
+    source = [ env.subst(str(f)) for f in source ]
+
+    try: out_dir = kw['out_dir']
+    except KeyError: out_dir = env.Dir('.')
+
+    mode = _import_option(env, 'import_mode', 'copy', **kw)
+    if mode not in _import_modes:
+        raise SCons.Errors.UserError("Unsupported import_mode: %r" % mode)
+
+    if _import_option(env, 'package', False, **kw):
+        kw = dict(kw, out_dir=out_dir, import_mode=mode)
+        return _import_packages(env, source, **kw)
+
+    recursive = _import_option(env, 'recursive', False, **kw)
+    lock = _import_lockfile(env, **kw)
+
+    bulk = _import_option(env, 'bulk', False, **kw)
+
+    target = []
+    if _import_option(env, 'lazy', False, **kw) and not recursive:
+        builder = _tds_lazy_builder(bulk)
+        group = _LazyImport(env, source, **kw)
+        nodes = []
+        for dname in source:
+            _tds_suffix(dname)
+            dst = env.File(dname, out_dir)
+            dst.attributes.texas_import = (dname, group)
+            if lock:
+                dst.attributes.texas_lock = (lock, dname)
+            nodes.append(dst)
+        if bulk:
+            target.extend(builder(env, nodes, [], TEXASIMPORTMODE=mode))
+            env.Precious(target)
+        else:
+            for dst in nodes:
+                target.extend(builder(env, dst, [], TEXASIMPORTMODE=mode))
+        return target
+
+    action = _tds_import_action()
+    if recursive:
+        found = _tds_resolve_closure(env, source, **kw)
+    else:
+        found = _tds_resolve(env, source, **kw)
+    if bulk:
+        group = _LazyImport(env, source, **kw)
+        group.found = found
+    nodes = []
+    sources = []
+    for dname, sname in found.items():
+        dst = env.File(dname, out_dir)
+        if lock:
+            dst.attributes.texas_lock = (lock, dname)
+        if not sname:
+            # Not found, reported when the target is built
+            dst.attributes.texas_import = (dname, None)
+        elif bulk:
+            dst.attributes.texas_import = (dname, group)
+            nodes.append(dst)
+            sources.append(sname[0])
+            continue
+        t = env.Command(dst, sname, action, TEXASIMPORTMODE=mode)
+        target.extend(t)
+    if nodes:
+        t = env.Command(nodes, sources, _tds_import_action(True),
+                        TEXASIMPORTMODE=mode)
+        env.Precious(t)
+        target.extend(t)
+
+    return target
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -27,114 +27,324 @@ __docformat__ = "restructuredText"
 
 from .about import __version__
 
-import SCons.Tool.dvipdf
-import SCons.Tool.latex
-import SCons.Tool.pdflatex
-import SCons.Tool.pdftex
-import SCons.Tool.tex
-
 from . import TeXASDist
 from . import TeXASDoc
+from . import TeXASImport
+
+# The SCons tools and site tools used by texas are imported when an
+# environment is being set up (see _setup_xxx()), so that loading texas
+# with TEXASLAZY doesn't pull in more than the pseudobuilders actually need.
+
+def _dvipdfm():
+    try:
+        import site_tools.dvipdfm as dvipdfm
+    except ImportError:
+        import sconstool.dvipdfm as dvipdfm
+    return dvipdfm
+
+def _kpsewhich():
+    try:
+        import site_tools.kpsewhich as kpsewhich
+    except ImportError:
+        import sconstool.kpsewhich as kpsewhich
+    return kpsewhich
+
+def _archives():
+    try:
+        import site_tools.archives as archives
+    except ImportError:
+        import sconstool.archives as archives
+    return archives
+
+_probe_version = 1
+_probe_caches = {}
+
+def _probe_stat(path):
+    """Return a (mtime, size) signature of a file or directory"""
+    import os
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime, st.st_size]
+
+class _ProbeCache(object):
+    """Persistent cache of program detection results.
+
+    An entry is identified by the program name and the ``PATH`` (and
+    ``PATHEXT``) it was searched in. Along with the result, the entry records
+    ``(mtime, size)`` signatures of the ``PATH`` directories searched until
+    the program was found (all of them, if it wasn't) and of the program
+    itself, and it's dropped when any of these has changed. Each entry is
+    verified once per process.
+    """
+
+    def __init__(self, path):
+        import json
+        self.path = path
+        self.dirty = False
+        self.checked = set()
+        data = None
+        if path:
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except (IOError, OSError, ValueError):
+                pass
+        if not isinstance(data, dict) or data.get('version') != _probe_version:
+            data = {'version': _probe_version, 'probes': {}}
+        self.data = data
+
+    def _stamp(self, dirs, found):
+        import os
+        stamp = []
+        if found:
+            where = os.path.normcase(os.path.dirname(found))
+        for d in dirs:
+            stamp.append(_probe_stat(d))
+            if found and os.path.normcase(d) == where:
+                break
+        if found:
+            stamp.append(_probe_stat(found))
+        return stamp
+
+    def detect(self, env, prog):
+        """Return full path to ``prog`` (or ``None``), as ``env.WhereIs()``"""
+        import os
+        import SCons.Util
+        ENV = env.get('ENV', dict())
+        path = ENV.get('PATH', '')
+        if SCons.Util.is_List(path):
+            path = os.pathsep.join(path)
+        key = '\0'.join([prog, path, ENV.get('PATHEXT', '')])
+        dirs = [d for d in path.split(os.pathsep) if d]
+        probes = self.data['probes']
+        entry = probes.get(key)
+        if entry is not None and key not in self.checked:
+            if self._stamp(dirs, entry['path']) != entry['stamp']:
+                entry = None
+        if entry is None:
+            found = env.WhereIs(prog)
+            entry = {'path': found, 'stamp': self._stamp(dirs, found)}
+            probes[key] = entry
+            self.dirty = True
+        self.checked.add(key)
+        return entry['path']
+
+    def save(self):
+        """Write the cache back to disk (if modified)."""
+        import os
+        import json
+        import SCons.Script
+        import SCons.Warnings
+        if not self.dirty or not self.path:
+            return
+        if SCons.Script.GetOption('no_exec') \
+                or SCons.Script.GetOption('clean'):
+            # Leave no files behind on dry runs and cleanups
+            return
+        tmp = self.path + '.tmp'
+        try:
+            d = os.path.dirname(self.path)
+            if d and not os.path.isdir(d):
+                os.makedirs(d)
+            with open(tmp, 'w') as f:
+                json.dump(self.data, f, sort_keys=True)
+            if os.path.exists(self.path) and not hasattr(os, 'replace'):
+                os.remove(self.path)
+            getattr(os, 'replace', os.rename)(tmp, self.path)
+        except (IOError, OSError) as e:
+            SCons.Warnings.warn(SCons.Warnings.WarningOnByDefault,
+                                "can't write TeXAS probe cache %r: %s"
+                                % (self.path, e))
+        else:
+            self.dirty = False
 
-try:
-    import site_tools.dvipdfm as dvipdfm
-except ImportError:
-    import sconstool.dvipdfm as dvipdfm
-
-try:
-    import site_tools.kpsewhich as kpsewhich
-except ImportError:
-    import sconstool.kpsewhich as kpsewhich
-
-try:
-    import site_tools.archives as archives
-except ImportError:
-    import sconstool.archives as archives
-
-_archives_generated = False
-_dvi_generated = False
-_pdf_generated = False
-_dvipdfm_generated = False
-_kpsewhich_generated = False
-
-def _generate_archives(env):
-    global _archives_generated
-    if not _archives_generated:
-        archives.generate(env)
-        env.AddMethod(TeXASDist.Tar, 'TeXASTar')
-        env.AddMethod(TeXASDist.TarGz, 'TeXASTarGz')
-        env.AddMethod(TeXASDist.TarBz2, 'TeXASTarBz2')
-        _archives_generated = True
-
-def _generate_dvi(env):
-    global _dvi_generated
-    if not _dvi_generated:
-        if SCons.Tool.tex.exists(env):
-            SCons.Tool.tex.generate(env)
-            _dvi_generated = True
-        if SCons.Tool.latex.exists(env):
-            SCons.Tool.latex.generate(env)
-            _dvi_generated = True
-        if _dvi_generated:
-            env.AddMethod(TeXASDoc.DVI, 'TeXASDVI')
-
-def _generate_pdf(env):
-    global _pdf_generated
-    if not _pdf_generated:
-        if SCons.Tool.dvipdf.exists(env):
-            SCons.Tool.dvipdf.generate(env)
-            # fix for the problem with out_dir
-            env['TEXASDVIPDFCOM'] = 'cd ${TARGET.dir} && ' \
-              + '$DVIPDF $DVIPDFFLAGS ${TARGET.rel_path(SOURCE)} ' \
-              + '${TARGET.file}'
-            _pdf_generated = True
-        if SCons.Tool.pdftex.exists(env):
-            SCons.Tool.pdftex.generate(env)
-            _pdf_generated = True
-        if SCons.Tool.pdflatex.exists(env):
-            SCons.Tool.pdflatex.generate(env)
-            _pdf_generated = True
-        if _pdf_generated:
-            env.AddMethod(TeXASDoc.PDF, 'TeXASPDF')
-
-def _generate_dvipdfm(env):
-    import SCons.Errors
-    global _dvipdfm_generated
-    if not _dvipdfm_generated:
-        dvipdfm.generate(env)
-        env.AddMethod(TeXASDoc.DVIPDFM, 'TeXASDVIPDFM')
+def _probe_cache(env):
+    """Return the program detection cache to be used by ``env``"""
+    import SCons.Util
+    try:
+        cache = env['TEXASPROBECACHE']
+    except KeyError:
+        cache = True
+    if not cache:
+        path = None
+    else:
+        if not SCons.Util.is_String(cache) and not hasattr(cache, 'abspath'):
+            cache = (env.subst('$CONFIGUREDIR') or '#/.sconf_temp') \
+                  + '/texas-probe.cache'
+        path = env.File(cache).abspath
+    try:
+        return _probe_caches[path]
+    except KeyError:
+        _probe_caches[path] = _ProbeCache(path)
+        return _probe_caches[path]
+
+def _detect(env, prog):
+    """Cached equivalent of ``env.Detect(prog)``"""
+    if _probe_cache(env).detect(env, prog):
+        return prog
+    return None
+
+def _setup_archives(env):
+    _archives().generate(env)
+    env.AddMethod(TeXASDist.Tar, 'TeXASTar')
+    env.AddMethod(TeXASDist.TarGz, 'TeXASTarGz')
+    env.AddMethod(TeXASDist.TarBz2, 'TeXASTarBz2')
+    env.AddMethod(TeXASDist.TarXz, 'TeXASTarXz')
+    env.AddMethod(TeXASDist.Zip, 'TeXASZip')
+    return True
+
+def _setup_dvi(env):
+    import SCons.Tool.tex
+    import SCons.Tool.latex
+    SCons.Tool.tex.generate_darwin(env)
+    generated = False
+    if _detect(env, 'tex'):
+        SCons.Tool.tex.generate(env)
+        generated = True
+    if _detect(env, 'latex'):
+        SCons.Tool.latex.generate(env)
+        generated = True
+    if generated:
+        env.AddMethod(TeXASDoc.DVI, 'TeXASDVI')
+    return generated
+
+def _setup_pdf(env):
+    import SCons.Tool.tex
+    import SCons.Tool.dvipdf
+    import SCons.Tool.pdftex
+    import SCons.Tool.pdflatex
+    SCons.Tool.tex.generate_darwin(env)
+    generated = False
+    if _detect(env, 'dvipdf'):
+        SCons.Tool.dvipdf.generate(env)
         # fix for the problem with out_dir
-        env['TEXASDVIPDFMCOM'] = 'cd ${TARGET.dir} && ' \
-            + '$DVIPDFM $DVIPDFMFLAGS -o ${TARGET.file} ' \
-            + '${TARGET.rel_path(SOURCE)}'
-        _dvipdfm_generated = True
+        env['TEXASDVIPDFCOM'] = 'cd ${TARGET.dir} && ' \
+          + '$DVIPDF $DVIPDFFLAGS ${TARGET.rel_path(SOURCE)} ' \
+          + '${TARGET.file}'
+        generated = True
+    if _detect(env, 'pdftex'):
+        SCons.Tool.pdftex.generate(env)
+        generated = True
+    if _detect(env, 'pdflatex'):
+        SCons.Tool.pdflatex.generate(env)
+        generated = True
+    if generated:
+        env.AddMethod(TeXASDoc.PDF, 'TeXASPDF')
+    return generated
 
-def _generate_kpsewhich(env):
-    import SCons.Errors
-    global _kpsewhich_generated
-    if not _kpsewhich_generated:
-        kpsewhich.generate(env)
-        env.AddMethod(TeXASCommon.ImportFromTDS, 'TeXASImport')
-        _kpsewhich_generated = True
+def _setup_dvipdfm(env):
+    _dvipdfm().generate(env)
+    env.AddMethod(TeXASDoc.DVIPDFM, 'TeXASDVIPDFM')
+    # fix for the problem with out_dir
+    env['TEXASDVIPDFMCOM'] = 'cd ${TARGET.dir} && ' \
+        + '$DVIPDFM $DVIPDFMFLAGS -o ${TARGET.file} ' \
+        + '${TARGET.rel_path(SOURCE)}'
+    return True
 
+def _setup_kpsewhich(env):
+    import SCons.Util
+    kpsewhich = _kpsewhich()
+    # Same as kpsewhich.generate(), which is guarded to run only once per
+    # process, but with cached detection of the kpsewhich program
+    env.SetDefault(KPSEWHICH = _detect(env, 'kpsewhich') or 'kpsewhich',
+                   KPSEWHICHFLAGS = SCons.Util.CLVar([]),
+                   KPSEWHICHCHDIR = '.')
+    env.AddMethod(kpsewhich.KPSFindFiles, 'KPSFindFiles')
+    env.AddMethod(kpsewhich.KPSFindAllFiles, 'KPSFindAllFiles')
+    env.AddMethod(kpsewhich.KPSExpandBraces, 'KPSExpandBraces')
+    env.AddMethod(kpsewhich.KPSExpandPath, 'KPSExpandPath')
+    env.AddMethod(kpsewhich.KPSExpandVar, 'KPSExpandVar')
+    env.AddMethod(kpsewhich.KPSShowPath, 'KPSShowPath')
+    env.AddMethod(kpsewhich.KPSVarValue, 'KPSVarValue')
+    env.AddMethod(TeXASImport.ImportFromTDS, 'TeXASImport')
+    return True
 
-def generate(env):
-    _generate_archives(env)
-    _generate_dvi(env)
-    _generate_pdf(env)
-    _generate_dvipdfm(env)
-    _generate_kpsewhich(env)
+# Methods attached as stubs when TEXASLAZY is set; each stub runs the listed
+# setup functions on first use and then dispatches to the real method. Once
+# the setups of other stubs are done as well, these are replaced too.
+_lazy_methods = [
+    ('TeXASTar', TeXASDist.Tar, [_setup_archives]),
+    ('TeXASTarGz', TeXASDist.TarGz, [_setup_archives]),
+    ('TeXASTarBz2', TeXASDist.TarBz2, [_setup_archives]),
+    ('TeXASTarXz', TeXASDist.TarXz, [_setup_archives]),
+    ('TeXASZip', TeXASDist.Zip, [_setup_archives]),
+    ('TeXASDVI', TeXASDoc.DVI, [_setup_dvi]),
+    ('TeXASPDF', TeXASDoc.PDF, [_setup_pdf]),
+    ('TeXASDVIPDFM', TeXASDoc.DVIPDFM, [_setup_dvipdfm]),
+    ('TeXASImport', TeXASImport.ImportFromTDS, [_setup_kpsewhich]),
+    ('TeXASDoc', TeXASDoc.Doc, [_setup_dvi, _setup_pdf, _setup_dvipdfm]),
+    ('TeXASDocs', TeXASDoc.Docs, [_setup_dvi, _setup_pdf, _setup_dvipdfm]),
+]
+
+def _lazy_setup(env, setups):
+    """Run ``setups`` not yet done on ``env``, return results of all of them.
+    The results are recorded in ``env``, so they're inherited by clones."""
+    try:
+        done = env['_TEXASLAZYSETUPS']
+    except KeyError:
+        done = env['_TEXASLAZYSETUPS'] = {}
+    pending = [setup for setup in setups if setup.__name__ not in done]
+    for setup in pending:
+        done[setup.__name__] = setup(env)
+    if pending:
+        _probe_cache(env).save()
+    return [done[setup.__name__] for setup in setups]
+
+def _lazy_install(env):
+    """Replace the stubs, whose setups are all done, with real methods"""
+    done = env['_TEXASLAZYSETUPS']
+    for name, method, setups in _lazy_methods:
+        if all(setup.__name__ in done for setup in setups) and \
+           any(done[setup.__name__] for setup in setups):
+            env.AddMethod(method, name)
+
+def _lazy_stub(name, method, setups):
+    def stub(env, *args, **kw):
+        import SCons.Errors
+        results = _lazy_setup(env, setups)
+        if not any(results):
+            raise SCons.Errors.UserError("%s is not available, the tools it "
+                                         "relies on were not found" % name)
+        _lazy_install(env)
+        return getattr(env, name)(*args, **kw)
+    return stub
+
+def _generate_eager(env):
+    _setup_archives(env)
+    _setup_dvi(env)
+    _setup_pdf(env)
+    _setup_dvipdfm(env)
+    _setup_kpsewhich(env)
     env.AddMethod(TeXASDoc.Doc, 'TeXASDoc')
+    env.AddMethod(TeXASDoc.Docs, 'TeXASDocs')
+
+def _generate_lazy(env):
+    for name, method, setups in _lazy_methods:
+        env.AddMethod(_lazy_stub(name, method, setups), name)
+
+def generate(env):
+    if env.get('TEXASLAZY'):
+        _generate_lazy(env)
+    else:
+        _generate_eager(env)
+        _probe_cache(env).save()
     env.AddMethod(TeXASCommon.RmDup, 'TeXASRmDup')
+    env.AddMethod(TeXASCommon.RmDupAll, 'TeXASRmDupAll')
     env.AddMethod(TeXASCommon.Children, 'TeXASChildren')
+    env.AddMethod(TeXASCommon.IterChildren, 'TeXASIterChildren')
 
 def exists(env):
-    SCons.Tool.tex.generate_darvin(env)
-    return SCons.dvipdf.exists(env) and \
-           (SCons.pdftex.exists(env) or SCons.pdflatex.exists(env)) and \
-           (SCons.latex.exists(env) or SCons.tex.exists(env) and \
-           dvipdfm.exists(env) and kpsewhich.exists(env) and \
-           archives.exists(env))
+    import SCons.Tool.tex
+    SCons.Tool.tex.generate_darwin(env)
+    result = _detect(env, 'dvipdf') and \
+           (_detect(env, 'pdftex') or _detect(env, 'pdflatex')) and \
+           (_detect(env, 'latex') or _detect(env, 'tex')) and \
+           _detect(env, 'dvipdfm') and _detect(env, 'kpsewhich') and \
+           _archives().exists(env)
+    _probe_cache(env).save()
+    return result
 
 # Local Variables:
 # # tab-width:4
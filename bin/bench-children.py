@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+# Benchmark of TeXASChildren()
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+import importlib.util
+
+def load_texas_common():
+    path = os.path.join(_topsrcdir, 'TeXASCommon.py')
+    spec = importlib.util.spec_from_file_location('TeXASCommon', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def make_tree(top, files, dirs):
+    for i in range(files):
+        d = os.path.join(top, 'dir%03d' % (i % dirs))
+        if not os.path.isdir(d):
+            os.makedirs(d)
+        with open(os.path.join(d, 'file%06d.tex' % i), 'w') as f:
+            f.write('')
+
+def measure(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+def main():
+    import SCons.Environment
+    common = load_texas_common()
+    top = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        make_tree(top, _args.files, _args.dirs)
+        os.chdir(top)
+        env = SCons.Environment.Environment(tools=[])
+        # Make the files known to SCons, as if they were sources or targets
+        env.Glob('dir*/*.tex')
+        dirs = [env.Dir('dir%03d' % i) for i in range(_args.dirs)]
+        # Aliases sharing most of their directories
+        aliases = [env.Alias('alias%d' % i, dirs[i:] + dirs[:i // 2])[0]
+                   for i in range(_args.aliases)]
+
+        import time
+        t0 = time.time()
+        for alias in aliases:
+            common.Children(env, alias)
+        first = time.time() - t0
+        repeat = measure(lambda: [common.Children(env, a) for a in aliases],
+                         _args.repeat)
+        print("%d files, %d dirs, %d aliases" % (_args.files, _args.dirs,
+                                                 _args.aliases))
+        print("%-12s %10s" % ('call', 'time[s]'))
+        print("%-12s %10.4f" % ('first', first))
+        print("%-12s %10.4f" % ('repeat', repeat))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(top)
+    return 0
+
+# The script...
+_script = os.path.basename(sys.argv[0])
+_scriptabs = os.path.realpath(sys.argv[0])
+_scriptdir = os.path.dirname(_scriptabs)
+_topsrcdir = os.path.realpath(os.path.join(_scriptdir, '..'))
+
+_parser = argparse.ArgumentParser(
+        prog=_script,
+        description="""\
+        Measure the time spent by TeXASChildren() on a tree of files reachable
+        through several overlapping directory aliases, on the first call (which
+        fills the memo) and on repeated calls (which validate the memo).
+        """)
+
+_parser.add_argument('--files',
+                      type=int,
+                      default=8000,
+                      metavar='N',
+                      help='number of files in the tree')
+_parser.add_argument('--dirs',
+                      type=int,
+                      default=200,
+                      metavar='D',
+                      help='number of directories the files are spread over')
+_parser.add_argument('--aliases',
+                      type=int,
+                      default=20,
+                      metavar='A',
+                      help='number of (overlapping) aliases')
+_parser.add_argument('--repeat',
+                      type=int,
+                      default=3,
+                      metavar='R',
+                      help='number of repetitions (the best one is reported)')
+
+_args = _parser.parse_args()
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
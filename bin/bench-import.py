@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+# Benchmark of the time spent on loading the texas tool
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+# Run by a fresh interpreter for every sample, prints the times (in seconds)
+# of the first (cold) and the second (warm) load of the tool
+_child = """\
+import sys
+import time
+sys.path[:0] = [%(scons)r, %(site)r]
+import SCons.Script
+import SCons.Environment
+times = []
+for i in range(2):
+    t0 = time.time()
+    SCons.Environment.Environment(tools=['texas'], toolpath=[%(tools)r],
+                                  TEXASLAZY=%(lazy)r)
+    times.append(time.time() - t0)
+print('%%r %%r' %% tuple(times))
+"""
+
+def scons_path():
+    import SCons
+    return os.path.dirname(os.path.dirname(SCons.__file__))
+
+def make_site(top):
+    tooldir = os.path.join(top, 'site_scons', 'site_tools', 'texas')
+    os.makedirs(tooldir)
+    for name in os.listdir(_topsrcdir):
+        if name in ('__init__.py', 'about.py') or \
+           (name.startswith('TeXAS') and name.endswith('.py')):
+            shutil.copy(os.path.join(_topsrcdir, name), tooldir)
+    return os.path.join(top, 'site_scons')
+
+def measure(top, site, lazy, repeat):
+    code = _child % {'scons': scons_path(),
+                     'site': site,
+                     'tools': os.path.join(site, 'site_tools'),
+                     'lazy': lazy}
+    cold = []
+    warm = []
+    for i in range(repeat):
+        out = subprocess.check_output([sys.executable, '-c', code], cwd=top,
+                                      universal_newlines=True)
+        c, w = [float(x) for x in out.split()[-2:]]
+        cold.append(c)
+        warm.append(w)
+    return min(cold), min(warm)
+
+def importtime(top, site):
+    code = 'import sys; sys.path[:0] = %r; import SCons.Script; ' \
+           'import site_tools.texas' % [scons_path(), site]
+    proc = subprocess.Popen([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=top, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, universal_newlines=True)
+    out, err = proc.communicate()
+    return [line for line in err.splitlines() if 'texas' in line]
+
+def main():
+    top = tempfile.mkdtemp()
+    try:
+        site = make_site(top)
+        header = "%10s %12s %12s" % ('mode', 'cold[ms]', 'warm[ms]')
+        print(header)
+        for lazy in (True, False):
+            cold, warm = measure(top, site, lazy, _args.repeat)
+            print("%10s %12.1f %12.1f" % ('lazy' if lazy else 'eager',
+                                          1000 * cold, 1000 * warm))
+        if _args.importtime:
+            print('')
+            for line in importtime(top, site):
+                print(line)
+    finally:
+        shutil.rmtree(top)
+    return 0
+
+# The script...
+_script = os.path.basename(sys.argv[0])
+_scriptabs = os.path.realpath(sys.argv[0])
+_scriptdir = os.path.dirname(_scriptabs)
+_topsrcdir = os.path.realpath(os.path.join(_scriptdir, '..'))
+
+_parser = argparse.ArgumentParser(
+        prog=_script,
+        description="""\
+        Measure the time of loading the texas tool into a construction
+        environment, in lazy (TEXASLAZY=True) and eager mode. Each sample
+        runs in a fresh interpreter; "cold" is the first load in the process,
+        "warm" the second one.
+        """)
+
+_parser.add_argument('--repeat',
+                      type=int,
+                      default=5,
+                      metavar='R',
+                      help='number of repetitions (the best one is reported)')
+_parser.add_argument('--importtime',
+                      action='store_true',
+                      help='print -X importtime breakdown of the tool modules')
+
+_args = _parser.parse_args()
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+# Micro-benchmark for TeXASRmDup() and TeXASRmDupAll()
+
+import argparse
+import os
+import sys
+import timeit
+import importlib.util
+
+def load_texas_common():
+    path = os.path.join(_topsrcdir, 'TeXASCommon.py')
+    spec = importlib.util.spec_from_file_location('TeXASCommon', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def make_nodes(env, count, dups):
+    unique = max(1, int(count / (1.0 + dups)))
+    names = ['dir%03d/file%07d.tex' % (i % 1000, i) for i in range(unique)]
+    nodes = [env.File(n) for n in names]
+    nodes = (nodes * (count // unique + 1))[:count]
+    names = (names * (count // unique + 1))[:count]
+    return names, nodes
+
+def measure(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+def main():
+    import SCons.Environment
+    import SCons.Util
+    common = load_texas_common()
+    env = SCons.Environment.Environment(tools=[])
+
+    header = "%10s %12s %12s %12s %12s %12s" % ('nodes', 'strings[s]',
+                                                 'nodes[s]', 'nodelist[s]',
+                                                 'all[s]', 'ns/node')
+    print(header)
+    for count in _args.sizes:
+        names, nodes = make_nodes(env, count, _args.dups)
+        lists = [nodes[i::_args.lists] for i in range(_args.lists)]
+        t_str = measure(lambda: common.RmDup(env, names), _args.repeat)
+        t_node = measure(lambda: common.RmDup(env, nodes), _args.repeat)
+        nodelist = SCons.Util.NodeList(nodes)
+        t_list = measure(lambda: common.RmDup(env, nodelist), _args.repeat)
+        t_all = measure(lambda: common.RmDupAll(env, lists), _args.repeat)
+        print("%10d %12.4f %12.4f %12.4f %12.4f %12.1f" %
+              (count, t_str, t_node, t_list, t_all, 1e9 * t_node / count))
+    return 0
+
+def sizes_list(s):
+    try:
+        return [int(float(x)) for x in s.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError('wrong list of sizes %r' % s)
+
+# The script...
+_script = os.path.basename(sys.argv[0])
+_scriptabs = os.path.realpath(sys.argv[0])
+_scriptdir = os.path.dirname(_scriptabs)
+_topsrcdir = os.path.realpath(os.path.join(_scriptdir, '..'))
+
+_parser = argparse.ArgumentParser(
+        prog=_script,
+        description="""\
+        Measure the time spent by TeXASRmDup() and TeXASRmDupAll() on lists
+        of file nodes of various sizes. The time per node (last column) should
+        remain roughly constant as the number of nodes grows.
+        """)
+
+_parser.add_argument('--sizes',
+                      type=sizes_list,
+                      default=[100000, 300000, 1000000],
+                      metavar='N[,N...]',
+                      help='comma-separated numbers of nodes to test with')
+_parser.add_argument('--dups',
+                      type=float,
+                      default=0.25,
+                      metavar='RATIO',
+                      help='ratio of duplicated to unique nodes')
+_parser.add_argument('--lists',
+                      type=int,
+                      default=8,
+                      metavar='K',
+                      help='number of lists passed to TeXASRmDupAll()')
+_parser.add_argument('--repeat',
+                      type=int,
+                      default=3,
+                      metavar='R',
+                      help='number of repetitions (the best one is reported)')
+
+_args = _parser.parse_args()
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+
+# Benchmark of the store-only handling of incompressible archive members
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+import importlib.util
+
+def load_texas_archive():
+    path = os.path.join(_topsrcdir, 'TeXASArchive.py')
+    spec = importlib.util.spec_from_file_location('TeXASArchive', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def make_tree(top, count, pdf_ratio, size):
+    # PDFs are simulated by random (incompressible) data, the rest is text
+    import random
+    rnd = random.Random(0)
+    words = ['\\section', '\\begin{document}', 'lorem', 'ipsum', 'dolor',
+             'sit', 'amet', '\\end{document}', '$x^2$', '\\cite{foo}']
+    names = []
+    for i in range(count):
+        if rnd.random() < pdf_ratio:
+            name = os.path.join(top, 'doc%05d.pdf' % i)
+            data = os.urandom(size)
+        else:
+            name = os.path.join(top, 'src%05d.tex' % i)
+            text = ' '.join(rnd.choice(words) for j in range(size // 6))
+            data = text.encode()[:size]
+        with open(name, 'wb') as f:
+            f.write(data)
+        names.append(name)
+    return names
+
+def measure(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+def main():
+    import tarfile
+    import zipfile
+    import SCons.Environment
+    archive = load_texas_archive()
+    env = SCons.Environment.Environment(tools=[])
+    top = tempfile.mkdtemp()
+    try:
+        names = make_tree(top, _args.files, _args.pdf_ratio, _args.size)
+        out = os.path.join(top, 'out')
+        suffixes = archive.get_incompressible_suffixes(env)
+        grouped = archive.group_incompressible(names, suffixes)
+
+        def tar_gz():
+            with tarfile.open(out, 'w:gz') as tar:
+                for name in names:
+                    tar.add(name)
+
+        def texas_tgz(source, jobs):
+            e = env.Clone(TEXASTARJOBS=jobs,
+                          TEXASINCOMPRESSIBLELAST=source is grouped)
+            archive.TarGz([out], source, e)
+
+        def zip_deflate():
+            with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as z:
+                for name in names:
+                    z.write(name)
+
+        def texas_zip(jobs):
+            archive.Zip([out], names, env.Clone(TEXASZIPJOBS=jobs))
+
+        cases = [
+            ('tar.gz (TarFile)', tar_gz),
+            ('tgz jobs=1', lambda: texas_tgz(names, 1)),
+            ('tgz jobs=1 grouped', lambda: texas_tgz(grouped, 1)),
+            ('tgz jobs=%d grouped' % _args.jobs,
+                lambda: texas_tgz(grouped, _args.jobs)),
+            ('zip (zipfile)', zip_deflate),
+            ('zip jobs=1', lambda: texas_zip(1)),
+            ('zip jobs=%d' % _args.jobs, lambda: texas_zip(_args.jobs)),
+        ]
+        total = sum(os.path.getsize(name) for name in names)
+        print("%d files, %.1f MiB, %.0f%% PDF" % (len(names), total / 1048576.0,
+                                                  100 * _args.pdf_ratio))
+        print("%-22s %10s %10s" % ('case', 'time[s]', 'ratio'))
+        for label, func in cases:
+            t = measure(func, _args.repeat)
+            print("%-22s %10.3f %10.3f" % (label, t,
+                                           os.path.getsize(out) / float(total)))
+    finally:
+        shutil.rmtree(top)
+    return 0
+
+# The script...
+_script = os.path.basename(sys.argv[0])
+_scriptabs = os.path.realpath(sys.argv[0])
+_scriptdir = os.path.dirname(_scriptabs)
+_topsrcdir = os.path.realpath(os.path.join(_scriptdir, '..'))
+
+_parser = argparse.ArgumentParser(
+        prog=_script,
+        description="""\
+        Measure the wall time needed to archive a PDF-heavy tree with the
+        stock (TarFile, zipfile) compressors and with the TeXAS archive
+        writers, which store incompressible members and blocks.
+        """)
+
+_parser.add_argument('--files',
+                      type=int,
+                      default=400,
+                      metavar='N',
+                      help='number of files in the tree')
+_parser.add_argument('--pdf-ratio',
+                      type=float,
+                      default=0.7,
+                      metavar='RATIO',
+                      help='fraction of (incompressible) PDF files')
+_parser.add_argument('--size',
+                      type=lambda s: int(float(s)),
+                      default=256 << 10,
+                      metavar='BYTES',
+                      help='size of each file')
+_parser.add_argument('--jobs',
+                      type=int,
+                      default=4,
+                      metavar='N',
+                      help='number of jobs for the parallel cases')
+_parser.add_argument('--repeat',
+                      type=int,
+                      default=3,
+                      metavar='R',
+                      help='number of repetitions (the best one is reported)')
+
+_args = _parser.parse_args()
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#
+# Copyright (c) 2014-2020 by Paweł Tomulik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+# Benchmark of the block-parallel gzip/xz used by TeXASTarGz()/TeXASTarXz()
+
+import argparse
+import io
+import os
+import sys
+import tarfile
+import timeit
+import importlib.util
+
+def load_texas_archive():
+    path = os.path.join(_topsrcdir, 'TeXASArchive.py')
+    spec = importlib.util.spec_from_file_location('TeXASArchive', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def make_data(size):
+    # Mix of text-like (compressible) and random (incompressible) chunks
+    import random
+    rnd = random.Random(0)
+    words = [('%x' % rnd.getrandbits(32)).encode() for i in range(4096)]
+    chunks = []
+    while sum(len(c) for c in chunks) < size:
+        chunks.append(b' '.join(rnd.choice(words) for i in range(8192)))
+        chunks.append(os.urandom(16384))
+    return b''.join(chunks)[:size]
+
+def single(data, level):
+    if _args.format == 'xz':
+        import lzma
+        return lzma.compress(data, preset=level)
+    import gzip
+    f = io.BytesIO()
+    with gzip.GzipFile(fileobj=f, mode='wb', compresslevel=level) as gz:
+        gz.write(data)
+    return f.getvalue()
+
+def decompress(data):
+    if _args.format == 'xz':
+        import lzma
+        return lzma.decompress(data)
+    import gzip
+    return gzip.decompress(data)
+
+def parallel(archive, data, level, jobs, block_size):
+    f = io.BytesIO()
+    if _args.format == 'xz':
+        out = archive.XzWriter(f, level, jobs=jobs, block_size=block_size)
+    else:
+        out = archive.GzipWriter(f, 'bench', level, jobs=jobs,
+                                 block_size=block_size)
+    for i in range(0, len(data), tarfile.RECORDSIZE):
+        out.write(data[i:i+tarfile.RECORDSIZE])
+    out.close()
+    return f.getvalue()
+
+def measure(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+def main():
+    archive = load_texas_archive()
+    data = make_data(_args.size)
+    mib = len(data) / float(1 << 20)
+
+    header = "%10s %12s %12s %12s" % ('jobs', 'time[s]', 'MiB/s', 'ratio')
+    print(header)
+    out = single(data, _args.level)
+    t = measure(lambda: single(data, _args.level), _args.repeat)
+    print("%10s %12.4f %12.1f %12.3f" % (_args.format, t, mib / t,
+                                        len(out) / float(len(data))))
+    for jobs in _args.jobs:
+        out = parallel(archive, data, _args.level, jobs, _args.block_size)
+        if decompress(out) != data:
+            print("%s: jobs=%d produced corrupted stream" % (_script, jobs))
+            return 1
+        t = measure(lambda: parallel(archive, data, _args.level, jobs,
+                                     _args.block_size), _args.repeat)
+        print("%10d %12.4f %12.1f %12.3f" % (jobs, t, mib / t,
+                                            len(out) / float(len(data))))
+    return 0
+
+def jobs_list(s):
+    try:
+        return [int(x) for x in s.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError('wrong list of jobs %r' % s)
+
+# The script...
+_script = os.path.basename(sys.argv[0])
+_scriptabs = os.path.realpath(sys.argv[0])
+_scriptdir = os.path.dirname(_scriptabs)
+_topsrcdir = os.path.realpath(os.path.join(_scriptdir, '..'))
+
+_parser = argparse.ArgumentParser(
+        prog=_script,
+        description="""\
+        Compare the single-threaded gzip (or xz) compression with the
+        block-parallel one used by TeXASTarGz(jobs=N) (or TeXASTarXz(jobs=N)).
+        The data is a mix of compressible and incompressible chunks.
+        """)
+
+_parser.add_argument('--format',
+                      choices=['gz', 'xz'],
+                      default='gz',
+                      help='compression format')
+_parser.add_argument('--size',
+                      type=lambda s: int(float(s)),
+                      default=64 << 20,
+                      metavar='BYTES',
+                      help='size of the data to compress')
+_parser.add_argument('--jobs',
+                      type=jobs_list,
+                      default=[1, 2, 4, 8],
+                      metavar='N[,N...]',
+                      help='comma-separated numbers of jobs to test with')
+_parser.add_argument('--level',
+                      type=int,
+                      default=6,
+                      metavar='L',
+                      help='compression level (or xz preset)')
+_parser.add_argument('--block-size',
+                      type=int,
+                      default=1 << 20,
+                      metavar='BYTES',
+                      help='size of independently compressed blocks')
+_parser.add_argument('--repeat',
+                      type=int,
+                      default=3,
+                      metavar='R',
+                      help='number of repetitions (the best one is reported)')
+
+_args = _parser.parse_args()
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -44,7 +44,9 @@ class develop(setuptools.command.develop.develop):
 
     def run(self, *args, **kw):
         self._make_symlinks(['__init__.py', 'about.py',
-                             'TeXASCommon.py', 'TeXASDist.py', 'TeXASDoc.py'])
+                             'TeXASArchive.py', 'TeXASCommon.py',
+                             'TeXASDist.py', 'TeXASDoc.py',
+                             'TeXASImport.py'])
         setuptools.command.develop.develop.run(self, *args, **kw)
 
 
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+TODO: Write documentation
+"""
+
+import os
+
+here = os.path.dirname(__file__)
+preamble = os.path.join(here, '../../../../support/code/test_preamble.py')
+with open(os.path.join(preamble), 'r') as f:
+    exec(f.read())
+
+bar = os.path.join('dist', 'sub2', 'bar.txt')
+foo = os.path.join('dist', 'foo.txt')
+geez = os.path.join('dist', 'geez.txt')
+doc = os.path.join('dist', 'doc.tex')
+
+test.run(arguments = ['-Q', 'dist-files'])
+test.must_contain_all_lines(test.stdout(), [
+    'all: %s %s %s %s geez.txt\n' % (bar, doc, foo, geez),
+    'suffixes: %s %s %s geez.txt\n' % (bar, foo, geez),
+    'exclude: %s %s\n' % (doc, foo),
+    'depth: %s %s %s\n' % (doc, foo, geez)
+])
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+TODO: Write documentation
+"""
+
+import os
+import sys
+import TestSCons
+
+if sys.platform == 'win32':
+    test = TestSCons.TestSCons(program='scons.bat', interpreter=None)
+else:
+    test = TestSCons.TestSCons()
+
+
+test.dir_fixture('image')
+test.subdir(['src', 'site_scons'])
+test.subdir(['src', 'site_scons', 'site_tools'])
+test.subdir(['src', 'site_scons', 'site_tools', 'texas'])
+test.file_fixture('../../../../../../about.py', 'src/site_scons/site_tools/texas/about.py')
+test.file_fixture('../../../../../../__init__.py', 'src/site_scons/site_tools/texas/__init__.py')
+test.file_fixture('../../../../../../TeXASArchive.py', 'src/site_scons/site_tools/texas/TeXASArchive.py')
+test.file_fixture('../../../../../../TeXASCommon.py', 'src/site_scons/site_tools/texas/TeXASCommon.py')
+test.file_fixture('../../../../../../TeXASDist.py', 'src/site_scons/site_tools/texas/TeXASDist.py')
+test.file_fixture('../../../../../../TeXASDoc.py', 'src/site_scons/site_tools/texas/TeXASDoc.py')
+test.file_fixture('../../../../../../TeXASImport.py', 'src/site_scons/site_tools/texas/TeXASImport.py')
+test.subdir(['src', 'site_scons', 'site_tools', 'ci'])
+test.file_fixture('../../../../support/ci/__init__.py', 'src/site_scons/site_tools/ci/__init__.py')
+
+test.subdir(['share'])
+test.subdir(['share', 'texmf'])
+test.subdir(['share', 'texmf', 'tex'])
+test.subdir(['share', 'texmf', 'tex', 'latex'])
+test.subdir(['share', 'texmf', 'tex', 'latex', 'local'])
+test.subdir(['share', 'texmf', 'bibtex'])
+test.subdir(['share', 'texmf', 'bibtex', 'bib'])
+test.subdir(['share', 'texmf', 'bibtex', 'bib', 'local'])
+
+test.subdir(['share', 'texmf', 'tex', 'latex', 'other'])
+
+test.write( ['share', 'texmf', 'tex', 'latex', 'local', 'foo.cls'],
+            "orig-foo.cls" )
+test.write( ['share', 'texmf', 'bibtex', 'bib', 'local', 'foo.bib'],
+            "orig-foo.bib" )
+
+# Wrap kpsewhich with a script which logs its invocations
+kpslog = test.workpath('kpsewhich.log')
+kpsargs = []
+if sys.platform != 'win32':
+    kpsewhich = test.where_is('kpsewhich')
+    if kpsewhich:
+        test.write('kpsewhich', """#!%s
+import subprocess, sys
+with open(%r, 'a') as f:
+    f.write(' '.join(sys.argv[1:]) + '\\n')
+sys.exit(subprocess.call([%r] + sys.argv[1:]))
+""" % (sys.executable, kpslog, kpsewhich))
+        os.chmod(test.workpath('kpsewhich'), 0o755)
+        kpsargs = ['KPSEWHICH=' + test.workpath('kpsewhich')]
+
+def kpsewhich_spawns():
+    try:
+        with open(kpslog, 'r') as f:
+            lines = f.readlines()
+    except IOError:
+        lines = []
+    if os.path.exists(kpslog):
+        os.remove(kpslog)
+    return len(lines)
+
+# Dry run and cleanup leave no cache behind
+test.run(arguments=['-n'] + kpsargs, chdir='src')
+test.must_not_exist('src/texas.cache')
+test.run(arguments=['-c'] + kpsargs, chdir='src')
+test.must_not_exist('src/texas.cache')
+kpsewhich_spawns()
+
+# Cold run, the lookup results are written to the cache
+test.run(arguments=kpsargs, chdir='src')
+test.must_exist('src/texas.cache')
+test.must_contain('src/texas.cache', 'foo.cls')
+test.must_contain('src/texas.cache', 'missing.sty')
+test.must_contain('src/foo.cls', "orig-foo.cls")
+test.must_contain('src/foo.bib', "orig-foo.bib")
+test.must_not_exist('src/missing.sty')
+kpsewhich_spawns()
+
+# Warm run, files found in cache must still be tracked
+test.write( ['share', 'texmf', 'tex', 'latex', 'local', 'foo.cls'],
+            "updated-foo.cls" )
+test.run(arguments=kpsargs, chdir='src')
+test.must_contain('src/foo.cls', "updated-foo.cls")
+# ... and neither found nor missing files are looked up again
+if kpsargs:
+    spawns = kpsewhich_spawns()
+    if spawns != 0:
+        print("Warm run should not spawn kpsewhich, but it did %d time(s)"
+              % spawns)
+        test.fail_test()
+
+# File moved within TDS, the stale cache entry must be re-resolved
+os.remove(test.workpath('share', 'texmf', 'tex', 'latex', 'local', 'foo.cls'))
+test.write( ['share', 'texmf', 'tex', 'latex', 'other', 'foo.cls'],
+            "moved-foo.cls" )
+test.run(arguments=kpsargs, chdir='src')
+test.must_contain('src/foo.cls', "moved-foo.cls")
+
+# Cleanup
+test.run(arguments=['-c'] + kpsargs, chdir='src')
+test.must_not_exist('src/foo.cls')
+test.must_not_exist('src/foo.bib')
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
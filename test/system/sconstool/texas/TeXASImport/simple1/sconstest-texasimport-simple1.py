@@ -41,9 +41,11 @@ test.subdir(['src', 'site_scons', 'site_tools'])
 test.subdir(['src', 'site_scons', 'site_tools', 'texas'])
 test.file_fixture('../../../../../../about.py', 'src/site_scons/site_tools/texas/about.py')
 test.file_fixture('../../../../../../__init__.py', 'src/site_scons/site_tools/texas/__init__.py')
+test.file_fixture('../../../../../../TeXASArchive.py', 'src/site_scons/site_tools/texas/TeXASArchive.py')
 test.file_fixture('../../../../../../TeXASCommon.py', 'src/site_scons/site_tools/texas/TeXASCommon.py')
 test.file_fixture('../../../../../../TeXASDist.py', 'src/site_scons/site_tools/texas/TeXASDist.py')
 test.file_fixture('../../../../../../TeXASDoc.py', 'src/site_scons/site_tools/texas/TeXASDoc.py')
+test.file_fixture('../../../../../../TeXASImport.py', 'src/site_scons/site_tools/texas/TeXASImport.py')
 test.subdir(['src', 'site_scons', 'site_tools', 'ci'])
 test.file_fixture('../../../../support/ci/__init__.py', 'src/site_scons/site_tools/ci/__init__.py')
 
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+Aliases are built only when out of date if ``TEXASALWAYSBUILD`` is ``False``,
+the ``always_build`` keyword overrides it.
+"""
+
+import os
+
+alias = 'package-tar'
+tarname = 'package.tar'
+always_alias = 'always-tar'
+always_tarname = 'always.tar'
+
+here = os.path.dirname(__file__)
+preamble = os.path.join(here, '../../../../support/code/test_preamble.py')
+with open(os.path.join(preamble), 'r') as f:
+    exec(f.read())
+
+# First invocation builds the archive
+test.run(arguments = alias)
+test.must_exist(test.workpath(tarname))
+
+# Second invocation performs no actions
+test.up_to_date(arguments = alias)
+
+# With always_build=True the alias is still rebuilt each time
+test.run(arguments = always_alias)
+test.must_exist(test.workpath(always_tarname))
+test.not_up_to_date(arguments = always_alias)
+
+# Cleanup
+# Options given as strings
+test.run(arguments = ['nostr-tar', 'kwstr-tar'])
+test.up_to_date(arguments = 'nostr-tar kwstr-tar')
+
+test.run(arguments=['-c', alias, always_alias, 'nostr-tar', 'kwstr-tar'])
+test.must_not_exist(test.workpath(tarname))
+test.must_not_exist(test.workpath(always_tarname))
+test.must_not_exist(test.workpath('nostr.tar'))
+test.must_not_exist(test.workpath('kwstr.tar'))
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+TODO: Write documentation
+"""
+
+import os
+import tarfile
+
+srcfiles = sorted(['geez.txt', 'sub1/foo.txt', 'sub1/sub2/bar.txt'])
+
+here = os.path.dirname(__file__)
+preamble = os.path.join(here, '../../../../support/code/test_preamble.py')
+with open(os.path.join(preamble), 'r') as f:
+    exec(f.read())
+
+# Dry run and cleanup leave no probe cache behind
+test.run(arguments = ['-n', 'package1-tar', 'package2-tar'])
+test.must_not_exist(test.workpath('.sconf_temp/texas-probe.cache'))
+test.must_not_exist(test.workpath('package1.tar'))
+test.run(arguments = ['-c', 'package1-tar', 'package2-tar'])
+test.must_not_exist(test.workpath('.sconf_temp/texas-probe.cache'))
+
+# Normal invocation
+test.run(arguments = ['package1-tar', 'package2-tar'])
+test.must_exist(test.workpath('.sconf_temp/texas-probe.cache'))
+
+for tarname in ['package1.tar', 'package2.tar']:
+    test.must_exist(test.workpath(tarname))
+    with tarfile.open(tarname, 'r') as tar:
+        tarfiles = sorted(tar.getnames())
+        if not (srcfiles == tarfiles):
+            print("The archive %s should contain following files: " \
+                % test.workpath(tarname))
+            print('  ' + str(srcfiles))
+            print("but it contains:")
+            print('  ' + str(tarfiles))
+            test.fail_test()
+
+# Second run uses cached probes
+test.up_to_date(arguments = 'package1.tar package2.tar')
+
+# Cleanup
+test.run(arguments=['-c', 'package1-tar', 'package2-tar'])
+test.must_not_exist(test.workpath('package1.tar'))
+test.must_not_exist(test.workpath('package2.tar'))
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
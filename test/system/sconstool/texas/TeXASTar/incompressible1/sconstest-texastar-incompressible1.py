@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+TODO: Write documentation
+"""
+import os
+import tarfile
+
+alias = 'incompressible1-tar'
+tarname = 'incompressible1.tar'
+srcfiles = ['b.txt', 'd.txt', 'a.pdf', 'c.png']
+
+here = os.path.dirname(__file__)
+preamble = os.path.join(here, '../../../../support/code/test_preamble.py')
+with open(os.path.join(preamble), 'r') as f:
+    exec(f.read())
+
+def check_order(alias, tarname, srcfiles):
+    test.run(arguments = alias)
+    test.must_exist(test.workpath(tarname))
+
+    with tarfile.open(test.workpath(tarname), 'r') as tar:
+        tarfiles = tar.getnames()
+        if not (srcfiles == tarfiles):
+            print("The archive %s should contain following files "
+                  "(in order): " % test.workpath(tarname))
+            print('  ' + str(srcfiles))
+            print("but it contains:")
+            print('  ' + str(tarfiles))
+            test.fail_test()
+
+check_order(alias, tarname, srcfiles)
+
+# Options given as strings
+check_order('grouped1-tar', 'grouped1.tar', srcfiles)
+check_order('plain1-tar', 'plain1.tar', sorted(srcfiles))
+check_order('plain2-tar', 'plain2.tar', sorted(srcfiles))
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+TODO: Write documentation
+"""
+import os
+import time
+import tarfile
+import zipfile
+
+archives = ['reproducible1.tar', 'reproducible1.tar.gz',
+            'reproducible1.tar.bz2', 'reproducible1.zip']
+srcfiles = ['geez.txt', 'sub1', 'sub1/bar.txt', 'sub1/foo.txt']
+
+here = os.path.dirname(__file__)
+preamble = os.path.join(here, '../../../../support/code/test_preamble.py')
+with open(os.path.join(preamble), 'r') as f:
+    exec(f.read())
+
+def build():
+    test.run(arguments = '.')
+    contents = {}
+    for name in archives:
+        with open(test.workpath(name), 'rb') as f:
+            contents[name] = f.read()
+    test.run(arguments = ['-c', '.'])
+    return contents
+
+first = build()
+
+# Other mtimes (and permissions) of sources must not change the archives
+now = time.time()
+for name in ['geez.txt', 'sub1/foo.txt', 'sub1/bar.txt']:
+    os.utime(test.workpath(name), (now + 100, now + 100))
+    os.chmod(test.workpath(name), 0o600)
+second = build()
+
+for name in archives:
+    if first[name] != second[name]:
+        print("%s is not reproducible" % name)
+        test.fail_test()
+
+test.run(arguments = '.')
+for name in archives[:3]:
+    with tarfile.open(test.workpath(name)) as tar:
+        members = tar.getmembers()
+        test.fail_test([m.name for m in members] != srcfiles)
+        for m in members:
+            test.fail_test(m.mtime != 1600000000)
+            test.fail_test(m.uid != 0 or m.gid != 0 or m.uname or m.gname)
+            test.fail_test(m.mode != (0o755 if m.isdir() else 0o644))
+
+with zipfile.ZipFile(test.workpath('reproducible1.zip')) as z:
+    names = [n.rstrip('/') for n in z.namelist()]
+    test.fail_test(names != srcfiles)
+    test.fail_test(z.getinfo('geez.txt').date_time != (2020, 9, 13, 12, 26, 40))
+
+# Options given as strings
+for name in ['plain1.tar.gz', 'plain2.tar']:
+    with tarfile.open(test.workpath(name)) as tar:
+        test.fail_test(tar.getmember('geez.txt').mtime == 1600000000)
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+TODO: Write documentation
+"""
+import os
+import zipfile
+
+alias = 'incremental1-zip'
+zipname = 'incremental1.zip'
+idxname = 'incremental1.zip.texasidx'
+
+here = os.path.dirname(__file__)
+preamble = os.path.join(here, '../../../../support/code/test_preamble.py')
+with open(os.path.join(preamble), 'r') as f:
+    exec(f.read())
+
+test.write('a.pdf', 'AAAA' * 1000)
+test.write('b.txt', 'bbbb' * 1000)
+test.write('c.txt', 'cccc' * 1000)
+
+test.run(arguments = alias)
+test.must_exist(test.workpath(zipname))
+test.must_exist(test.workpath(idxname))
+test.up_to_date(arguments = zipname)
+
+# Tamper with the (stored) a.pdf in the previous archive, keeping its size
+# and mtime, so the index still matches it
+path = test.workpath(zipname)
+st = os.stat(path)
+with open(path, 'rb') as f:
+    data = f.read()
+with open(path, 'wb') as f:
+    f.write(data.replace(b'AAAA' * 10, b'ZZZZ' * 10, 1))
+os.utime(path, (st.st_atime, st.st_mtime))
+
+# Only b.txt changes, a.pdf must be copied verbatim from previous archive
+test.write('b.txt', 'BBBB' * 1000)
+test.run(arguments = alias)
+with open(path, 'rb') as f:
+    test.fail_test(b'ZZZZ' * 10 not in f.read())
+with zipfile.ZipFile(path) as z:
+    test.fail_test(z.read('b.txt') != b'BBBB' * 1000)
+    test.fail_test(z.read('c.txt') != b'cccc' * 1000)
+
+# Cleanup removes the index too
+test.run(arguments = ['-c', alias])
+test.must_not_exist(test.workpath(zipname))
+test.must_not_exist(test.workpath(idxname))
+
+# Options given as strings
+test.run(arguments = ['incremental2-zip', 'full1-zip', 'full2-zip'])
+test.must_exist(test.workpath('incremental2.zip.texasidx'))
+test.must_exist(test.workpath('full1.zip'))
+test.must_not_exist(test.workpath('full1.zip.texasidx'))
+test.must_exist(test.workpath('full2.zip'))
+test.must_not_exist(test.workpath('full2.zip.texasidx'))
+test.run(arguments = ['-c', 'incremental2-zip'])
+test.must_not_exist(test.workpath('incremental2.zip.texasidx'))
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4:
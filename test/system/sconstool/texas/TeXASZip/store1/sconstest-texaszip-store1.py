@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2013-2020 by Paweł Tomulik <ptomulik@meil.pw.edu.pl>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE
+
+__docformat__ = "restructuredText"
+
+"""
+TODO: Write documentation
+"""
+import os
+import random
+import zipfile
+
+alias = 'store1-zip'
+zipname = 'store1.zip'
+
+here = os.path.dirname(__file__)
+preamble = os.path.join(here, '../../../../support/code/test_preamble.py')
+with open(os.path.join(preamble), 'r') as f:
+    exec(f.read())
+
+# Compressible text, and incompressible data with and without known suffix
+rnd = random.Random(0)
+noise = bytes(bytearray(rnd.getrandbits(8) for i in range(16384)))
+test.write('doc.txt', 'Lorem ipsum dolor sit amet\n' * 1000)
+test.write('doc.pdf', 'Lorem ipsum dolor sit amet\n' * 1000)
+test.write('noise.dat', noise, mode='wb')
+
+test.run(arguments = alias)
+test.must_exist(test.workpath(zipname))
+
+with zipfile.ZipFile(test.workpath(zipname)) as z:
+    test.fail_test(z.testzip() is not None)
+    test.fail_test(z.getinfo('doc.txt').compress_type != zipfile.ZIP_DEFLATED)
+    test.fail_test(z.getinfo('doc.pdf').compress_type != zipfile.ZIP_STORED)
+    test.fail_test(z.getinfo('noise.dat').compress_type != zipfile.ZIP_STORED)
+    test.fail_test(z.read('noise.dat') != noise)
+
+test.pass_test()
+
+# Local Variables:
+# # tab-width:4
+# # indent-tabs-mode:nil
+# # End:
+# vim: set syntax=python expandtab tabstop=4 shiftwidth=4: